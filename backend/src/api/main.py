@@ -4,37 +4,83 @@ Handles all ML predictions, analytics, and explainability
 WITH GRACEFUL MODEL LOADING FOR CLOUD RUN
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import os
+
+# Single-threaded BLAS/OpenMP per call: request concurrency comes from the
+# inference executor, so per-call thread pools would only oversubscribe cores.
+# Must be set before numpy (and its BLAS) is first imported; explicit env wins
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
-import joblib
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, ValidationError, root_validator
 import numpy as np
 import pandas as pd
-import json
-import os
+import asyncio
+import orjson
 import sys
-from typing import List, Optional, Dict, Any
-from google.cloud import storage
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Literal
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
 
-# Add parent directory to path
+# Add parent directory to path (and this one, for model_download when run as src.api.main)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'training'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import your existing modules
-from data_preprocessing import RealEstateDataPreprocessor
-from predictive_models import RealEstatePredictiveModels
+# (joblib, GCS, TensorFlow/SHAP/LangChain and numba kernels are imported lazily inside
+# ModelManager so the server can bind before the heavy imports run)
+from data_preprocessing import (
+    RealEstateDataPreprocessor, YES_NO_MAP, FURNISHING_MAP, CATEGORY_MAPS
+)
 from investment_analytics import InvestmentAnalytics
-from explainability import ModelExplainability
-from chatbot import RealEstateInvestmentChatbot
+from model_download import download_models, gcs_client
 
-logging.basicConfig(level=logging.INFO)
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, which Cloud Logging ingests as a structured entry"""
+
+    def format(self, record):
+        entry = {
+            "severity": record.levelname,
+            "time": self.formatTime(record),
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
+# Log calls use lazy %-formatting: arguments are only rendered for records
+# that pass the level. LOG_FORMAT=json switches to structured output
+_log_handler = logging.StreamHandler()
+if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+    _log_handler.setFormatter(JsonFormatter())
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), handlers=[_log_handler])
 logger = logging.getLogger(__name__)
+BANNER = "=" * 60
 
 app = FastAPI(
     title="Real Estate Investment Advisor API",
     description="ML-powered API for real estate predictions and investment analysis",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS Configuration
@@ -50,36 +96,41 @@ app.add_middleware(
 # Pydantic Models (Pydantic v1 syntax)
 # ============================================================================
 
+YesNo = Literal["yes", "no"]
+FurnishingStatus = Literal["furnished", "semi-furnished", "unfurnished"]
+CHOICE_FIELDS = (
+    "mainroad", "guestroom", "basement", "hotwaterheating",
+    "airconditioning", "prefarea", "furnishingstatus"
+)
+
+
 class PropertyInput(BaseModel):
     """Input for price prediction"""
     area: float = Field(..., gt=0, description="Area in square feet")
     bedrooms: int = Field(..., ge=0)
     bathrooms: int = Field(..., ge=0)
     stories: int = Field(..., ge=1)
-    mainroad: str
-    guestroom: str
-    basement: str
-    hotwaterheating: str
-    airconditioning: str
+    mainroad: YesNo
+    guestroom: YesNo
+    basement: YesNo
+    hotwaterheating: YesNo
+    airconditioning: YesNo
     parking: int = Field(..., ge=0)
-    prefarea: str
-    furnishingstatus: str
-
-    @validator(
-        "mainroad", "guestroom", "basement",
-        "hotwaterheating", "airconditioning", "prefarea"
-    )
-    def validate_yes_no(cls, v):
-        if v.lower() not in ["yes", "no"]:
-            raise ValueError('Must be "yes" or "no"')
-        return v.lower()
-
-    @validator("furnishingstatus")
-    def validate_furnishing(cls, v):
-        valid = ["furnished", "semi-furnished", "unfurnished"]
-        if v.lower() not in valid:
-            raise ValueError(f"Must be one of {valid}")
-        return v.lower()
+    prefarea: YesNo
+    furnishingstatus: FurnishingStatus
+
+    # Membership is checked by the Literal types; this only normalizes case, in one
+    # callback for all seven fields instead of one per-field validator call each
+    @root_validator(pre=True)
+    def lowercase_choices(cls, values):
+        lowered = None
+        for field in CHOICE_FIELDS:
+            v = values.get(field)
+            if isinstance(v, str) and not v.islower():
+                if lowered is None:
+                    lowered = dict(values)
+                lowered[field] = v.lower()
+        return values if lowered is None else lowered
 
     class Config:
         schema_extra = {
@@ -162,6 +213,10 @@ class ExplainabilityResponse(BaseModel):
     top_features: List[Dict[str, Any]]
 
 
+class PredictionExplanationResponse(PredictionResponse, ExplainabilityResponse):
+    pass
+
+
 class ChatRequest(BaseModel):
     message: str
     context: Optional[Dict[str, Any]] = None
@@ -183,6 +238,126 @@ class ModelStatus(BaseModel):
     error_message: Optional[str] = None
 
 
+# ============================================================================
+# Response cache for repeated property inputs
+# ============================================================================
+
+INPUT_FIELDS = tuple(PropertyInput.__fields__)
+
+
+def input_key(data: BaseModel) -> tuple:
+    """Canonical hashable key for a validated request model (fields in class order)"""
+    return tuple(data.__dict__.values())
+
+
+# ============================================================================
+# Direct request-body parsing for the hot POST endpoints
+# ============================================================================
+
+def parse_body(model, body: bytes):
+    """
+    orjson-parse and validate a JSON body against `model` in one step, skipping
+    FastAPI's per-request dependency solving; errors are the same 422 payload
+    """
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError([{
+            "loc": ("body", e.pos), "msg": "JSON decode error",
+            "type": "value_error.jsondecode", "ctx": {"error": e.msg}
+        }], body=body)
+    try:
+        return model.parse_obj(data)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors()], body=data
+        )
+
+
+def json_body(model) -> dict:
+    """openapi_extra documenting `model` as the JSON request body of a parse_body route"""
+    return {"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": model.schema()}}
+    }}
+
+
+def utc_now_iso():
+    """Current UTC time as an ISO-8601 string at one-second resolution"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class ExplanationUnavailable(RuntimeError):
+    """SHAP returned no explanation (explainer missing or failed); never cached"""
+
+
+class LRUCache:
+    """Small thread-safe LRU map (shared by the event loop and executor threads)"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> task computing it; only touched from the event loop
+        self._inflight = {}
+        # Bumped by clear(): computes started before it don't store their result
+        self._generation = 0
+
+    async def get_or_compute(self, key, compute):
+        """
+        Cached value for `key`, else the result of `await compute()`. Identical
+        requests arriving while it runs await the same task instead of
+        starting their own; shield() keeps a disconnecting caller from
+        cancelling it for the others.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, compute))
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, key, compute):
+        generation = self._generation
+        try:
+            value = await compute()
+            with self._lock:
+                if generation == self._generation:
+                    self._put(key, value)
+            return value
+        finally:
+            if generation == self._generation:
+                self._inflight.pop(key, None)
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._put(key, value)
+
+    def _put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop cached values and detach in-flight computes (e.g. on model reload)"""
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            self._inflight = {}
+
+
 # ============================================================================
 # Model Manager with Graceful Loading
 # ============================================================================
@@ -190,16 +365,56 @@ class ModelStatus(BaseModel):
 class ModelManager:
     """Manages all ML models and components with graceful degradation"""
 
+    REQUIRED_FILES = ("preprocessor.pkl", "metadata.json")
+
     def __init__(self):
         self.preprocessor = None
         self.models = None
         self.analytics = None
-        self.explainability = None
-        self.chatbot = None
+        self._explainability = None
+        self._chatbot = None
+        self._component_lock = threading.Lock()
+        self.lazy_components = os.getenv('LAZY_COMPONENTS', 'true').lower() == 'true'
         self.metadata = None
+        self.best_model_name = None
+        self.ort_session = None
+        self.ort_input_name = None
         self.models_loaded = False
         self.last_loaded = None
         self.load_error = None
+        # get_status() payload, rebuilt only after a load/reload changes state
+        self._status_snapshot = None
+
+        # Wall-clock ISO stamp refreshed once a second by tick_clock(), so
+        # responses don't build and format a datetime per request
+        self.now_iso = utc_now_iso()
+
+        # Fast inference path: fixed column order + encoder positions cached at load
+        self.feature_order = None
+        self.encoder_positions = None
+        self.scaler_mean = None
+        self.scaler_scale = None
+        self.encode_row = None
+
+        # SHAP state: global top features are computed once per load, per-row
+        # explanations are memoized on the scaled row bytes
+        self.background = None
+        self.global_top_features = None
+        self.explain_top_k = int(os.getenv('EXPLAIN_TOP_K', '5'))
+        self._shap_row_cache = lru_cache(
+            maxsize=int(os.getenv('SHAP_CACHE_SIZE', '4096'))
+        )(self._explain_row)
+
+        # Whole-response caches keyed by input_key(), for clients replaying a property
+        cache_size = int(os.getenv('RESPONSE_CACHE_SIZE', '8192'))
+        self.prediction_cache = LRUCache(cache_size)
+        self.explain_cache = LRUCache(cache_size)
+        self.analysis_cache = LRUCache(cache_size)
+        # PREFETCH_EXPLAIN: after /predict, compute /explain for the same property in
+        # the background; at most PREFETCH_EXPLAIN_SLOTS at once, extras are dropped
+        self.prefetch_explain = os.getenv('PREFETCH_EXPLAIN', 'true').lower() == 'true'
+        self.prefetch_slots = asyncio.Semaphore(int(os.getenv('PREFETCH_EXPLAIN_SLOTS', '2')))
+        self._prefetch_tasks = set()
 
         self.allow_startup_without_models = os.getenv(
             'ALLOW_STARTUP_WITHOUT_MODELS', 
@@ -207,144 +422,237 @@ class ModelManager:
         ).lower() == 'true'
 
         self.bucket_name = os.getenv('GCS_BUCKET_NAME')
+        self._storage_client = None
         self.gcs_model_path = os.getenv('GCS_MODEL_PATH', 'models/latest')
         self.local_model_path = os.getenv('LOCAL_MODEL_PATH', '/app/models/saved_models')
+        self.download_workers = int(os.getenv('GCS_DOWNLOAD_WORKERS', '8'))
+        self.download_chunk_size = int(os.getenv('GCS_CHUNK_SIZE_MB', '8')) * 1024 * 1024
+        self.sliced_download_threshold = int(os.getenv('GCS_SLICED_DOWNLOAD_MB', '32')) * 1024 * 1024
+        # GCS_VERIFY_CHECKSUM=false skips the serial CRC32c pass for trusted buckets
+        self.verify_checksums = os.getenv('GCS_VERIFY_CHECKSUM', 'true').lower() == 'true'
+        self.fast_featurize = os.getenv('FAST_FEATURIZE', 'true').lower() == 'true'
+        # USE_FP32: hand float32 feature rows to the model (checked for parity at load)
+        self.feature_dtype = (
+            np.float32 if os.getenv('USE_FP32', 'false').lower() == 'true' else np.float64
+        )
+        self.use_onnx = os.getenv('USE_ONNX', 'true').lower() == 'true'
+        # LOAD_PREPROCESSOR_PICKLE: always unpickle preprocessor.pkl, even when
+        # feature_layout.json + scaler.npy could featurize without it
+        self.load_preprocessor_pickle = os.getenv(
+            'LOAD_PREPROCESSOR_PICKLE', 'false'
+        ).lower() == 'true'
 
-    def download_from_gcs(self) -> bool:
-        """Download models from GCS bucket"""
-        try:
-            if not self.bucket_name:
-                logger.warning("GCS_BUCKET_NAME not set, skipping GCS download")
-                return False
-
-            logger.info(f"📥 Downloading models from gs://{self.bucket_name}/{self.gcs_model_path}")
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(self.bucket_name)
-
-            os.makedirs(self.local_model_path, exist_ok=True)
-
-            blobs = list(bucket.list_blobs(prefix=self.gcs_model_path))
-
-            if not blobs:
-                logger.warning(f"❌ No model files found in gs://{self.bucket_name}/{self.gcs_model_path}")
-                return False
+        self.model_n_jobs = int(os.getenv('MODEL_N_JOBS', '1'))
 
-            downloaded_count = 0
-            for blob in blobs:
-                if not blob.name.endswith('/'):
-                    local_file = os.path.join(self.local_model_path, os.path.basename(blob.name))
-                    blob.download_to_filename(local_file)
-                    logger.info(f"✅ Downloaded: {blob.name} → {local_file}")
-                    downloaded_count += 1
+        # CPU-bound inference (predict, SHAP, analytics) runs here, off the event loop
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('INFERENCE_WORKERS', os.cpu_count() or 1)),
+            thread_name_prefix='inference'
+        )
 
-            logger.info(f"📦 Downloaded {downloaded_count} files from GCS")
-            return downloaded_count > 0
+    def _gcs_client(self):
+        """Create the storage client once; reloads reuse its credentials and connections"""
+        if self._storage_client is None:
+            self._storage_client = gcs_client(self.download_workers)
+        return self._storage_client
 
+    def download_from_gcs(self) -> bool:
+        """Download models from GCS bucket"""
+        if not self.bucket_name:
+            logger.warning("GCS_BUCKET_NAME not set, skipping GCS download")
+            return False
+        try:
+            client = self._gcs_client()
         except Exception as e:
-            logger.error(f"❌ Error downloading from GCS: {e}", exc_info=True)
+            logger.error("❌ Error downloading from GCS: %s", e, exc_info=True)
             return False
+        return download_models(
+            client, self.bucket_name, self.gcs_model_path, self.local_model_path,
+            download_workers=self.download_workers,
+            chunk_size=self.download_chunk_size,
+            sliced_threshold=self.sliced_download_threshold,
+            verify_checksums=self.verify_checksums
+        )
+
+    @contextmanager
+    def _download_lock(self):
+        """
+        Exclusive flock on local_model_path/.lock so that, with several uvicorn
+        workers, only one downloads from GCS while the others wait and reuse the files
+        """
+        os.makedirs(self.local_model_path, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.local_model_path, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _local_files(self):
+        """Names of the files in local_model_path (one scandir), or None if it is missing"""
+        try:
+            with os.scandir(self.local_model_path) as entries:
+                return {entry.name for entry in entries}
+        except FileNotFoundError:
+            return None
+
+    def has_local_models(self) -> bool:
+        """True when the required artifacts are already on disk (e.g. baked into the image)"""
+        available_files = self._local_files()
+        return available_files is not None and all(
+            f in available_files for f in self.REQUIRED_FILES
+        )
 
-    def load_all_models(self) -> bool:
+    def load_all_models(self, force_download: bool = False) -> bool:
         """Load all models and components"""
         try:
-            logger.info("=" * 60)
+            logger.info(BANNER)
             logger.info("🚀 STARTING MODEL LOADING SEQUENCE")
-            logger.info("=" * 60)
+            logger.info(BANNER)
 
-            # Step 1: Try to download from GCS if bucket is configured
-            if self.bucket_name:
-                logger.info(f"Step 1: Attempting GCS download from bucket '{self.bucket_name}'")
-                self.download_from_gcs()
-            else:
+            # Step 1: Try to download from GCS if bucket is configured. Models baked
+            # into the image are used as-is; reload_models() fetches fresh ones itself.
+            # The check runs under the download lock, so workers that waited on the
+            # first one find the files on disk and skip straight to loading
+            if not self.bucket_name:
                 logger.warning("Step 1: Skipped (GCS_BUCKET_NAME not configured)")
-
-            # Step 2: Check if local models exist
-            logger.info(f"Step 2: Checking local model path: {self.local_model_path}")
-            if not os.path.exists(self.local_model_path):
-                logger.error(f"❌ Model path does not exist: {self.local_model_path}")
+            else:
+                with self._download_lock():
+                    if self.has_local_models() and not force_download:
+                        logger.info("Step 1: Skipped (models already present locally)")
+                    else:
+                        logger.info("Step 1: Attempting GCS download from bucket '%s'", self.bucket_name)
+                        self.download_from_gcs()
+
+            # Step 2: Check if local models exist. One scandir lists the directory;
+            # the checks below are set lookups instead of a stat() per file
+            logger.info("Step 2: Checking local model path: %s", self.local_model_path)
+            available_files = self._local_files()
+            if available_files is None:
+                logger.error("❌ Model path does not exist: %s", self.local_model_path)
                 if not self.allow_startup_without_models:
                     raise FileNotFoundError(f"Model path not found: {self.local_model_path}")
                 return False
 
             # Step 3: List available files
-            available_files = os.listdir(self.local_model_path)
-            logger.info(f"📂 Available files in {self.local_model_path}: {available_files}")
+            logger.info("📂 Available files in %s: %s", self.local_model_path, sorted(available_files))
 
             # Step 4: Check for required files
             logger.info("Step 3: Checking for required files")
-            required_files = ["preprocessor.pkl", "metadata.json"]
             missing_files = []
-            for f in required_files:
-                path = os.path.join(self.local_model_path, f)
-                if not os.path.exists(path):
+            for f in self.REQUIRED_FILES:
+                if f not in available_files:
                     missing_files.append(f)
-                    logger.warning(f"⚠️  Missing: {f}")
+                    logger.warning("⚠️  Missing: %s", f)
                 else:
-                    logger.info(f"✅ Found: {f}")
+                    logger.info("✅ Found: %s", f)
 
             if missing_files:
-                logger.error(f"❌ Missing required files: {missing_files}")
+                logger.error("❌ Missing required files: %s", missing_files)
                 if not self.allow_startup_without_models:
                     raise FileNotFoundError(f"Missing required files: {missing_files}")
                 return False
 
-            # Step 5: Load preprocessor
-            logger.info("Step 4: Loading preprocessor...")
-            preprocessor_path = os.path.join(self.local_model_path, "preprocessor.pkl")
-            self.preprocessor = joblib.load(preprocessor_path)
-            logger.info(f"✅ Preprocessor loaded: {preprocessor_path}")
+            # Step 5: Load metadata (tiny; tells us which model file to load)
+            logger.info("Step 4: Loading metadata...")
+            metadata_path = os.path.join(self.local_model_path, "metadata.json")
+            self.metadata = orjson.loads(Path(metadata_path).read_bytes())
+            self.best_model_name = self.metadata["best_model"]
+            logger.info("✅ Metadata loaded: %s", self.best_model_name)
+
+            # Step 6: Load preprocessor, best model and ONNX session concurrently;
+            # all are disk reads + unpickling/graph setup that release the GIL for
+            # much of the work
+            logger.info("Step 5: Loading preprocessor and predictive model...")
+            import joblib
+            from predictive_models import RealEstatePredictiveModels
 
-            # Step 6: Load predictive models
-            logger.info("Step 5: Loading predictive models...")
+            preprocessor_path = os.path.join(self.local_model_path, "preprocessor.pkl")
+            # feature_layout.json + scaler.npy cover the whole inference transform
+            # when the fast path applies; the pickle is then never executed
+            layout = None if self.load_preprocessor_pickle else self._read_feature_layout()
             self.models = RealEstatePredictiveModels()
-            self.models.load_models(self.local_model_path)
-            logger.info(f"✅ Models loaded: {self.models.best_model_name}")
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix='model-load') as pool:
+                # Serve through onnxruntime when the training run exported model.onnx
+                onnx_future = pool.submit(self._load_onnx_session)
+                # mmap_mode keeps the scaler's numpy arrays file-backed instead of copied
+                preprocessor_future = None
+                if layout is None:
+                    preprocessor_future = pool.submit(joblib.load, preprocessor_path, mmap_mode='r')
+                # Only the best model serves requests, so only its file is loaded;
+                # its arrays (e.g. sklearn tree nodes) are mapped read-only as well
+                models_future = pool.submit(
+                    self.models.load_models, self.local_model_path,
+                    [self.best_model_name], 'r'
+                )
+                if preprocessor_future is not None:
+                    self.preprocessor = preprocessor_future.result()
+                models_future.result()
+                onnx_future.result()
+
+            self._cache_feature_layout(layout)
+            self._cache_scaler_stats()
+            self._verify_fast_path()
+            if self.preprocessor is not None:
+                logger.info("✅ Preprocessor loaded: %s", preprocessor_path)
+            else:
+                logger.info("✅ Feature layout and scaler statistics loaded (preprocessor.pkl not unpickled)")
 
-            # Step 7: Load metadata
-            logger.info("Step 6: Loading metadata...")
-            metadata_path = os.path.join(self.local_model_path, "metadata.json")
-            with open(metadata_path, "r") as f:
-                self.metadata = json.load(f)
-            logger.info(f"✅ Metadata loaded: {self.metadata.get('best_model', 'unknown')}")
+            # load_models() doesn't know which model won training; pin it from metadata
+            self.models.best_model_name = self.best_model_name
+            self.models.best_model = self.models.models[self.best_model_name]
+            self._limit_model_threads(self.models.best_model)
+            logger.info("✅ Model loaded: %s", self.best_model_name)
 
-            # Step 8: Initialize analytics
-            logger.info("Step 7: Initializing analytics...")
+            # Step 7: Initialize analytics
+            logger.info("Step 6: Initializing analytics...")
             self.analytics = InvestmentAnalytics()
             logger.info("✅ Analytics initialized")
 
-            # Step 9: Initialize explainability
-            logger.info("Step 8: Initializing explainability...")
-            self.explainability = ModelExplainability(
-                model=self.models.models[self.models.best_model_name],
-                preprocessor=self.preprocessor
-            )
-            logger.info("✅ Explainability initialized")
-
-            # Step 10: Initialize chatbot (optional)
-            logger.info("Step 9: Initializing chatbot...")
-            groq_api_key = os.getenv("GROQ_API_KEY")
-            if groq_api_key:
-                self.chatbot = RealEstateInvestmentChatbot(api_key=groq_api_key)
-                logger.info("✅ Chatbot initialized")
+            # Step 8: Load the SHAP background sample
+            logger.info("Step 7: Loading explainability background...")
+            background_path = os.path.join(self.local_model_path, "background.npy")
+            if os.path.exists(background_path):
+                # Read-only mapping like the pickles; SHAP only reads the sample
+                self.background = np.load(background_path, mmap_mode='r')
+            self._verify_fp32()
+
+            # Step 9: Explainability and chatbot are built on first use unless
+            # LAZY_COMPONENTS=false, so /predict-only instances never import SHAP/LangChain
+            logger.info("Step 8: Initializing explainability and chatbot...")
+            if self.lazy_components:
+                logger.info("⏳ Explainability and chatbot deferred until first use")
             else:
-                logger.warning("⚠️  GROQ_API_KEY not set, chatbot will be unavailable")
+                # Independent: SHAP setup is CPU work, the chatbot mostly imports
+                with ThreadPoolExecutor(max_workers=2, thread_name_prefix='component-init') as pool:
+                    futures = [pool.submit(self._init_explainability),
+                               pool.submit(self._init_chatbot)]
+                    for future in futures:
+                        future.result()
+
+            self._warmup()
 
             # Mark as ready
             self.models_loaded = True
-            self.last_loaded = datetime.utcnow().isoformat()
+            self.last_loaded = utc_now_iso()
             self.load_error = None
+            self._status_snapshot = None
 
-            logger.info("=" * 60)
+            logger.info(BANNER)
             logger.info("✅ ALL MODELS LOADED SUCCESSFULLY!")
-            logger.info("=" * 60)
+            logger.info(BANNER)
             return True
 
         except Exception as e:
-            logger.error("=" * 60)
-            logger.error(f"❌ ERROR DURING MODEL LOADING: {e}", exc_info=True)
-            logger.error("=" * 60)
+            logger.error(BANNER)
+            logger.error("❌ ERROR DURING MODEL LOADING: %s", e, exc_info=True)
+            logger.error(BANNER)
             self.load_error = str(e)
             self.models_loaded = False
+            self._status_snapshot = None
 
             if self.allow_startup_without_models:
                 logger.warning("⚠️  ALLOW_STARTUP_WITHOUT_MODELS=true, continuing without models")
@@ -353,38 +661,443 @@ class ModelManager:
                 logger.error("🚨 ALLOW_STARTUP_WITHOUT_MODELS=false, aborting startup")
                 raise
 
+    def _limit_model_threads(self, model):
+        """Run estimators with n_jobs (sklearn/xgboost/lightgbm) at MODEL_N_JOBS, default 1"""
+        get_params = getattr(model, 'get_params', None)
+        if get_params is None or 'n_jobs' not in get_params():
+            return
+        model.set_params(n_jobs=self.model_n_jobs)
+        logger.info("✅ %s limited to n_jobs=%d", self.best_model_name, self.model_n_jobs)
+
+    def _load_onnx_session(self):
+        """Open model.onnx with onnxruntime if available; otherwise keep the pickle"""
+        onnx_path = os.path.join(self.local_model_path, "model.onnx")
+        if not self.use_onnx or not os.path.exists(onnx_path):
+            return
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            logger.warning("⚠️  onnxruntime not installed, serving the pickled model")
+            return
+
+        # One intra-op thread per session call: concurrency comes from the inference
+        # executor (onnxruntime releases the GIL), not from oversubscribed op threads
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = int(os.getenv('ORT_INTRA_OP_THREADS', '1'))
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.ort_session = ort.InferenceSession(
+            onnx_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.ort_input_name = self.ort_session.get_inputs()[0].name
+        logger.info("✅ ONNX runtime session loaded: %s", onnx_path)
+
+    def predict(self, X):
+        """Predict prices for scaled feature rows (onnxruntime when loaded)"""
+        if self.ort_session is not None:
+            outputs = self.ort_session.run(
+                None, {self.ort_input_name: X.astype(np.float32, copy=False)}
+            )
+            return outputs[0].ravel()
+        return self.models.predict(X)
+
+    def _read_feature_layout(self):
+        """
+        Feature order from feature_layout.json, or None when the preprocessor
+        pickle is still needed (file missing, no scaler.npy, fast path off, a
+        layout the compiled encoder can't handle, or category codes that differ)
+        """
+        layout_path = os.path.join(self.local_model_path, "feature_layout.json")
+        stats_path = os.path.join(self.local_model_path, "scaler.npy")
+        if not (self.fast_featurize and os.path.exists(layout_path)
+                and os.path.exists(stats_path)):
+            return None
+        layout = orjson.loads(Path(layout_path).read_bytes())
+        feature_names = layout.get("feature_names") or []
+        if (sorted(feature_names) != sorted(INPUT_FIELDS)
+                or layout.get("category_maps") != CATEGORY_MAPS):
+            logger.warning("⚠️  feature_layout.json doesn't match this API, loading preprocessor.pkl")
+            return None
+        return feature_names
+
+    def _cache_feature_layout(self, feature_order=None):
+        """Cache the scaler's column order and encoder positions for the fast path"""
+        if feature_order is None:
+            feature_order = getattr(self.preprocessor, 'feature_names', None)
+            if not feature_order:
+                feature_order = getattr(self.preprocessor.scaler, 'feature_names_in_', [])
+        self.feature_order = [str(col) for col in feature_order]
+
+        # The compiled encoder writes PropertyInput fields straight into their
+        # scaler columns; only possible when the layout is exactly those fields
+        self.encoder_positions = None
+        if sorted(self.feature_order) == sorted(INPUT_FIELDS):
+            self.encoder_positions = np.array(
+                [self.feature_order.index(f) for f in INPUT_FIELDS], dtype=np.int64
+            )
+
+        if self.feature_order:
+            logger.info("✅ Fast featurization enabled for %s features", len(self.feature_order))
+        else:
+            logger.warning("⚠️  Preprocessor has no feature names, using DataFrame path")
+
+    def _verify_fast_path(self):
+        """Disable fast featurization if it disagrees with the DataFrame path"""
+        if not (self.fast_featurize and self.feature_order) or self.preprocessor is None:
+            return
+        sample = PropertyInput(**PropertyInput.Config.schema_extra["example"])
+        try:
+            fast = self.transform_input(sample)
+            reference = self._transform_dataframe(sample)
+            matches = np.allclose(fast, reference, rtol=1e-5, atol=1e-6)
+        except Exception as e:
+            logger.warning("⚠️  Fast featurization check failed: %s", e)
+            matches = False
+        if not matches:
+            logger.warning("⚠️  Fast featurization differs from the preprocessor, using DataFrame path")
+            self.fast_featurize = False
+
+    def _init_explainability(self):
+        """Build the SHAP explainer and precompute global importance"""
+        from explainability import ModelExplainability
+
+        explainability = ModelExplainability(
+            model=self.models.models[self.models.best_model_name],
+            X_train=self.background,
+            feature_names=self.feature_order
+        )
+        # Build the (Tree)Explainer now, once, rather than inside the first
+        # explain call where concurrent requests could each construct one
+        explainability.initialize_shap()
+        if self.background is not None:
+            importance = explainability.get_global_importance_arrays(self.background)
+            if importance is not None:
+                self.global_top_features = top_k_features(*importance, self.explain_top_k)
+            logger.info("✅ Global importance precomputed on %s rows", len(self.background))
+        else:
+            logger.warning("⚠️  background.npy missing, global importance computed per request")
+        # Published last, so readers never see a half-initialized explainer
+        self._explainability = explainability
+        logger.info("✅ Explainability initialized")
+
+    def _init_chatbot(self):
+        """Build the Groq chatbot if an API key is configured"""
+        groq_api_key = os.getenv("GROQ_API_KEY")
+        if groq_api_key:
+            from chatbot import RealEstateInvestmentChatbot
+
+            self._chatbot = RealEstateInvestmentChatbot(api_key=groq_api_key)
+            logger.info("✅ Chatbot initialized")
+        else:
+            logger.warning("⚠️  GROQ_API_KEY not set, chatbot will be unavailable")
+
+    @property
+    def explainability(self):
+        """SHAP explainability, built on first access once models are loaded"""
+        if self._explainability is None and self.models is not None:
+            with self._component_lock:
+                if self._explainability is None:
+                    self._init_explainability()
+        return self._explainability
+
+    @property
+    def chatbot(self):
+        """Chatbot, built on first access (None without GROQ_API_KEY)"""
+        if self._chatbot is None and os.getenv("GROQ_API_KEY"):
+            with self._component_lock:
+                if self._chatbot is None:
+                    self._init_chatbot()
+        return self._chatbot
+
+    def reset_chat(self):
+        """Clear chat history without building a chatbot that was never used"""
+        if self._chatbot is not None:
+            self._chatbot.reset_conversation()
+
+    def _warmup(self):
+        """
+        Run the example property through featurize -> predict (and SHAP when it is
+        already built) so first-call allocations happen before traffic arrives
+        """
+        try:
+            example = PropertyInput(**PropertyInput.Config.schema_extra["example"])
+            for _ in range(2):
+                X = self.transform_input(example)
+                self.predict(X)
+                if self._explainability is not None:
+                    self._explainability.explain_prediction_shap(X.astype(np.float64))
+            logger.info("✅ Warmup complete")
+        except Exception as e:
+            logger.warning("⚠️  Warmup failed (continuing): %s", e)
+
+    def _verify_fp32(self):
+        """Fall back to float64 inputs if float32 changes predictions beyond tolerance"""
+        if self.feature_dtype is not np.float32:
+            return
+        if self.background is not None:
+            sample = np.asarray(self.background, dtype=np.float64)
+        else:
+            example = PropertyInput(**PropertyInput.Config.schema_extra["example"])
+            if self.preprocessor is None:
+                sample = self._encode_input(example, np.float64)
+            else:
+                sample = self._transform_dataframe(example).astype(np.float64)
+        reference = self.models.predict(sample)
+        narrowed = self.predict(sample.astype(np.float32))
+        if np.allclose(narrowed, reference, rtol=1e-4):
+            logger.info("✅ float32 inference enabled (parity verified)")
+        else:
+            logger.warning("⚠️  float32 predictions differ from float64, keeping float64")
+            self.feature_dtype = np.float64
+
+    def _cache_scaler_stats(self):
+        """Load StandardScaler mean/scale for the direct (x - mean) / scale transform"""
+        stats_path = os.path.join(self.local_model_path, "scaler.npy")
+        if os.path.exists(stats_path):
+            stats = np.load(stats_path, mmap_mode='r')
+            mean, scale = stats[0], stats[1]
+        else:
+            scaler = self.preprocessor.scaler
+            n_features = len(self.feature_order)
+            mean = getattr(scaler, 'mean_', None)
+            scale = getattr(scaler, 'scale_', None)
+            if mean is None or not scaler.with_mean:
+                mean = np.zeros(n_features)
+            if scale is None or not scaler.with_std:
+                scale = np.ones(n_features)
+
+        # Plain float64 ndarrays (views, no copy) so the compiled kernel accepts them
+        self.scaler_mean = np.ascontiguousarray(mean, dtype=np.float64)
+        self.scaler_scale = np.ascontiguousarray(scale, dtype=np.float64)
+        if self.encoder_positions is not None:
+            # numba loads here, at model load, not at API import
+            import fast_kernels
+            self.encode_row = fast_kernels.encode_row
+            fast_kernels.warmup(self.scaler_mean, self.scaler_scale, self.encoder_positions)
+
+    def transform_input(self, property_input):
+        """Scale a single PropertyInput into the model feature matrix"""
+        if self.fast_featurize and self.encoder_positions is not None:
+            return self._encode_input(property_input, self.feature_dtype)
+
+        if self.fast_featurize and self.feature_order:
+            # Layout has extra columns: NumPy-only preprocessor transform
+            return self.preprocessor.transform_raw(property_input.__dict__).astype(
+                self.feature_dtype, copy=False
+            )
+
+        return self._transform_dataframe(property_input)
+
+    def _encode_input(self, p, dtype):
+        """Compiled encode + scale of one PropertyInput into a new 1 x n row"""
+        # A fresh row, not a reused buffer: /predict hands it to the
+        # micro-batcher, which reads it after this call has returned
+        X = np.empty((1, len(self.feature_order)), dtype=dtype)
+        self.encode_row(
+            p.area, p.bedrooms, p.bathrooms, p.stories,
+            YES_NO_MAP[p.mainroad], YES_NO_MAP[p.guestroom], YES_NO_MAP[p.basement],
+            YES_NO_MAP[p.hotwaterheating], YES_NO_MAP[p.airconditioning],
+            p.parking, YES_NO_MAP[p.prefarea], FURNISHING_MAP[p.furnishingstatus],
+            self.encoder_positions, self.scaler_mean, self.scaler_scale, X[0]
+        )
+        return X
+
+    def _transform_dataframe(self, property_input):
+        """Original pandas path (FAST_FEATURIZE=false or fast-path mismatch)"""
+        df = pd.DataFrame([property_input.dict()])
+        df_processed = self.preprocessor.process_housing_data(df)
+
+        if "price" in df_processed.columns:
+            df_processed = df_processed.drop(columns=["price"])
+
+        return self.preprocessor.scaler.transform(df_processed).astype(
+            self.feature_dtype, copy=False
+        )
+
+    def _explain_row(self, row_bytes):
+        X = np.frombuffer(row_bytes, dtype=np.float64).reshape(1, -1)
+        explanation = self.explainability.explain_prediction_shap(X)
+        if explanation is None:
+            # Raise rather than return, so lru_cache doesn't pin the failure
+            raise ExplanationUnavailable("SHAP explanation unavailable")
+        return explanation
+
+    def explain_shap(self, X):
+        """SHAP explanation for a single scaled row, memoized per input"""
+        row = np.ascontiguousarray(X[0], dtype=np.float64)
+        return self._shap_row_cache(row.tobytes())
+
+    async def tick_clock(self):
+        """Refresh now_iso every second (runs as a background task)"""
+        while True:
+            self.now_iso = utc_now_iso()
+            await asyncio.sleep(1)
+
+    async def run_blocking(self, fn, *args):
+        """Run a CPU-bound callable on the inference executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
+
     def reload_models(self):
         """Reload all models"""
         logger.info("🔄 Reloading models...")
+        # Fetch new artifacts while the current models keep serving; only the
+        # (disk-local) load below runs with the manager marked not ready
+        if self.bucket_name:
+            with self._download_lock():
+                self.download_from_gcs()
         self.preprocessor = None
+        self.feature_order = None
+        self.encoder_positions = None
+        self.fast_featurize = os.getenv('FAST_FEATURIZE', 'true').lower() == 'true'
+        self.feature_dtype = (
+            np.float32 if os.getenv('USE_FP32', 'false').lower() == 'true' else np.float64
+        )
+        self.scaler_mean = None
+        self.scaler_scale = None
+        self.encode_row = None
         self.models = None
         self.metadata = None
-        self.explainability = None
-        self.chatbot = None
+        self.best_model_name = None
+        self.ort_session = None
+        self.ort_input_name = None
+        self._explainability = None
+        self.background = None
+        self.global_top_features = None
+        self._shap_row_cache.cache_clear()
+        self.prediction_cache.clear()
+        self.explain_cache.clear()
+        self.analysis_cache.clear()
+        self._chatbot = None
         self.analytics = None
         self.models_loaded = False
+        self._status_snapshot = None
         return self.load_all_models()
 
     def is_ready(self):
         """Check if models are ready"""
         return self.models_loaded
 
-    def get_status(self):
-        """Get current model status"""
-        return ModelStatus(
-            models_loaded=self.models_loaded,
-            preprocessor_loaded=self.preprocessor is not None,
-            analytics_available=self.analytics is not None,
-            explainability_available=self.explainability is not None,
-            chatbot_available=self.chatbot is not None,
-            model_info=self.metadata,
-            last_loaded=self.last_loaded,
-            error_message=self.load_error
-        )
+    def get_status(self) -> dict:
+        """Current model status (ModelStatus fields), cached between loads"""
+        status = self._status_snapshot
+        if status is None:
+            status = {
+                "models_loaded": self.models_loaded,
+                "preprocessor_loaded": self.preprocessor is not None or self.scaler_mean is not None,
+                "analytics_available": self.analytics is not None,
+                "explainability_available": self._explainability is not None or self.models_loaded,
+                "chatbot_available": self._chatbot is not None or bool(os.getenv("GROQ_API_KEY")),
+                "model_info": self.metadata,
+                "last_loaded": self.last_loaded,
+                "error_message": self.load_error
+            }
+            # Only cache settled states; mid-load values would otherwise stick
+            if self.models_loaded or self.load_error is not None:
+                self._status_snapshot = status
+        return status
+
+
+# ============================================================================
+# Micro-batching for /predict
+# ============================================================================
+
+class BatchPredictor:
+    """Coalesces concurrent /predict rows into a single model.predict call"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.max_batch = int(os.getenv('PREDICT_MAX_BATCH', '32'))
+        self.window = float(os.getenv('PREDICT_BATCH_WINDOW_MS', '5')) / 1000.0
+        self.queue = None
+        self._task = None
+        self._inflight = set()
+
+    def start(self):
+        """Start the consumer task (must run inside the event loop)"""
+        if self._task is None:
+            self.queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._consumer())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, row):
+        """Queue one scaled feature row and wait for its prediction"""
+        if self._task is None:
+            return self.manager.predict(row.reshape(1, -1))[0]
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((row, future))
+        return await future
+
+    async def _consumer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+
+            # Give concurrent requests a short window to join this batch, but
+            # flush as soon as it is full instead of always sleeping the window.
+            # An idle predictor (nothing queued or in flight) skips the window so
+            # a lone request isn't delayed; bursts then queue up behind it
+            deadline = loop.time() + (self.window if self._inflight else 0.0)
+            while len(batch) < self.max_batch:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Predict in the background so the next batch can form (and run on
+            # another executor thread) while this one is in flight
+            task = asyncio.create_task(self._run_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch):
+        X = np.vstack([row for row, _ in batch])
+        try:
+            predictions = await self.manager.run_blocking(self.manager.predict, X)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result(prediction)
 
 
 logger.info("🔧 Initializing Model Manager...")
 model_manager = ModelManager()
+batch_predictor = BatchPredictor(model_manager)
+
+
+# Endpoints that need models loaded: reject during warm-up before the body
+# is read, so cold-start traffic skips JSON decoding and pydantic validation
+MODEL_PATHS = {"/predict", "/explain", "/predict_and_explain"}
+
+
+@app.middleware("http")
+async def warmup_guard(request: Request, call_next):
+    path = request.url.path
+    if path in MODEL_PATHS and not model_manager.is_ready():
+        return ORJSONResponse({"detail": "Models not loaded"}, status_code=503)
+    if path == "/analyze" and not model_manager.analytics:
+        return ORJSONResponse({"detail": "Analytics unavailable"}, status_code=503)
+    return await call_next(request)
 
 
 # ============================================================================
@@ -393,19 +1106,18 @@ model_manager = ModelManager()
 
 @app.get("/")
 async def root():
-    status = model_manager.get_status()
-    return {
+    return ORJSONResponse({
         "message": "Real Estate Investment Advisor API",
         "version": "1.0.0",
-        "models_ready": status.models_loaded
-    }
+        "models_ready": model_manager.models_loaded
+    })
 
 
 @app.get("/health")
 async def health_check():
     """Liveness probe - app is running (doesn't wait for models)"""
-    logger.debug("Health check called")
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    # Probes hit this constantly: a ready-made response skips jsonable_encoder
+    return ORJSONResponse({"status": "healthy", "timestamp": model_manager.now_iso})
 
 
 @app.get("/ready")
@@ -416,139 +1128,268 @@ async def readiness_check():
             status_code=503,
             detail=f"Models not loaded: {model_manager.load_error}"
         )
-    return {"status": "ready"}
+    return ORJSONResponse({"status": "ready"})
 
 
-@app.get("/models/status", response_model=ModelStatus)
+@app.get("/models/status", response_model=None, responses={200: {"model": ModelStatus}})
 async def model_status():
     """Get detailed model loading status"""
-    return model_manager.get_status()
+    return ORJSONResponse(model_manager.get_status())
 
 
 @app.post("/admin/reload")
 async def reload():
     """Manually reload all models"""
-    ok = model_manager.reload_models()
+    # Download + unpickling take seconds; keep the event loop serving meanwhile
+    ok = await asyncio.to_thread(model_manager.reload_models)
     return {"success": ok, "error": model_manager.load_error}
 
 
-@app.post("/predict", response_model=PredictionResponse)
-async def predict_price(property_input: PropertyInput):
+# Responses below are built from trusted server-side values (plain floats/str),
+# so they are returned as ORJSONResponse directly: no pydantic validation and no
+# jsonable_encoder walk. The pydantic classes only document the schema.
+async def _predicted_price(key, property_input: PropertyInput, X=None):
+    """Cached (and coalesced) price for one property; X is its feature row if already built"""
+    async def compute():
+        row = model_manager.transform_input(property_input) if X is None else X
+        return (await batch_predictor.submit(row[0])).item()
+
+    return await model_manager.prediction_cache.get_or_compute(key, compute)
+
+
+# Half-width of the reported 95% interval as a fraction of the price (1.96 * 10% std)
+CI_HALF_WIDTH = 1.96 * 0.1
+
+
+def _prediction_body(prediction: float, area: float) -> dict:
+    """Response body for a price that is already a plain Python float"""
+    half_width = prediction * CI_HALF_WIDTH
+
+    return {
+        "predicted_price": prediction,
+        "price_per_sqft": prediction / area,
+        "confidence_interval_lower": prediction - half_width,
+        "confidence_interval_upper": prediction + half_width,
+        "model_used": model_manager.best_model_name,
+        "prediction_date": model_manager.now_iso
+    }
+
+
+@app.post("/predict", response_model=None, responses={200: {"model": PredictionResponse}},
+          openapi_extra=json_body(PropertyInput))
+async def predict_price(request: Request):
+    property_input = parse_body(PropertyInput, await request.body())
     if not model_manager.is_ready():
         raise HTTPException(status_code=503, detail="Models not loaded")
 
     try:
-        df = pd.DataFrame([property_input.dict()])
-        df_processed = model_manager.preprocessor.process_housing_data(df)
+        key = input_key(property_input)
+        prediction = await _predicted_price(key, property_input)
+        prefetch_explain(key, property_input)
 
-        if "price" in df_processed.columns:
-            df_processed = df_processed.drop(columns=["price"])
+        return ORJSONResponse(_prediction_body(prediction, property_input.area))
+    except Exception as e:
+        logger.error("Prediction error: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        X = model_manager.preprocessor.scaler.transform(df_processed)
-        prediction = model_manager.models.predict(X)[0]
 
-        price_per_sqft = prediction / property_input.area
-        std_dev = prediction * 0.1
+def _analyze_investment(data: InvestmentInput):
+    """Blocking analytics for /analyze (runs on the inference executor)"""
+    analytics = model_manager.analytics
+    # comprehensive_analysis only reads keys, so hand it the validated
+    # field dict directly instead of copying it with .dict()
+    result = analytics.comprehensive_analysis(data.__dict__)
+    return result, analytics.investment_recommendation(result)
 
-        return PredictionResponse(
-            predicted_price=float(prediction),
-            price_per_sqft=float(price_per_sqft),
-            confidence_interval_lower=float(prediction - 1.96 * std_dev),
-            confidence_interval_upper=float(prediction + 1.96 * std_dev),
-            model_used=model_manager.metadata["best_model"],
-            prediction_date=datetime.utcnow().isoformat()
-        )
-    except Exception as e:
-        logger.error(f"Prediction error: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
 
+async def _analysis_response(data: InvestmentInput):
+    """Compute the /analyze response body"""
+    result, recommendation = await model_manager.run_blocking(
+        _analyze_investment, data
+    )
+
+    roi = result["roi"]
+    cash_flow = result["cash_flow"]
+    overall = recommendation["overall_recommendation"]
 
-@app.post("/analyze", response_model=InvestmentAnalysisResponse)
-async def analyze_investment(data: InvestmentInput):
+    return {
+        "roi": float(roi["roi_percentage"]),
+        "rental_yield": float(result["rental_yield"]["net_yield_percentage"]),
+        "cap_rate": float(result["cap_rate"]["cap_rate_percentage"]),
+        "cash_flow_monthly": float(cash_flow["monthly_cash_flow"]),
+        "cash_flow_annual": float(cash_flow["annual_cash_flow"]),
+        "total_return": float(roi["future_property_value"] + roi["total_rental_income"]
+                              - roi["total_expenses"]),
+        "appreciation_value": float(result["appreciation"]["total_appreciation"]),
+        "total_rental_income": float(roi["total_rental_income"]),
+        "total_expenses": float(roi["total_expenses"]),
+        "net_profit": float(roi["net_profit"]),
+        "investment_grade": overall.split(" - ")[0],
+        "recommendation": overall
+    }
+
+
+@app.post("/analyze", response_model=None, responses={200: {"model": InvestmentAnalysisResponse}},
+          openapi_extra=json_body(InvestmentInput))
+async def analyze_investment(request: Request):
+    data = parse_body(InvestmentInput, await request.body())
     if not model_manager.analytics:
         raise HTTPException(status_code=503, detail="Analytics unavailable")
 
     try:
-        result = model_manager.analytics.comprehensive_analysis(data.dict())
-        recommendation = model_manager.analytics.investment_recommendation(result)
-
-        return InvestmentAnalysisResponse(
-            roi=result["roi"],
-            rental_yield=result["rental_yield"],
-            cap_rate=result["cap_rate"],
-            cash_flow_monthly=result["monthly_cash_flow"],
-            cash_flow_annual=result["annual_cash_flow"],
-            total_return=result["total_return"],
-            appreciation_value=result["appreciation_value"],
-            total_rental_income=result["total_rental_income"],
-            total_expenses=result["total_expenses"],
-            net_profit=result["net_profit"],
-            investment_grade=recommendation["grade"],
-            recommendation=recommendation["recommendation"]
+        response = await model_manager.analysis_cache.get_or_compute(
+            input_key(data), lambda: _analysis_response(data)
         )
+        return ORJSONResponse(response)
     except Exception as e:
-        logger.error(f"Analysis error: {e}", exc_info=True)
+        logger.error("Analysis error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/explain", response_model=ExplainabilityResponse)
-async def explain_prediction(property_input: PropertyInput):
+def top_k_features(names, values, k):
+    """Top-k features by importance via partial selection instead of a full sort"""
+    k = min(k, len(values))
+    if k == 0:
+        return []
+    idx = np.argpartition(-values, k - 1)[:k]
+    idx = idx[np.argsort(-values[idx])]
+    return [{"feature": str(names[i]), "importance": float(values[i])} for i in idx]
+
+
+def _explain_property(property_input: PropertyInput, X=None):
+    """Blocking SHAP pipeline for /explain (runs on the inference executor)"""
+    if X is None:
+        X = model_manager.transform_input(property_input)
+    prediction = model_manager.predict(X)[0]
+
+    explainability = model_manager.explainability
+    explanation = model_manager.explain_shap(X)
+    top_features = model_manager.global_top_features
+    if top_features is None:
+        # No background sample: mean |SHAP| over this one row is just |SHAP| of the
+        # explanation already computed (sorted by |SHAP|), so skip a second SHAP pass
+        top_features = [
+            {"feature": feat, "importance": abs(data['shap_value'])}
+            for feat, data in islice(explanation.items(), model_manager.explain_top_k)
+        ]
+    explanation_text = explainability.generate_explanation_text(
+        explanation, float(prediction)
+    )
+    shap_vals = {feat: data['shap_value'] for feat, data in explanation.items()}
+    return shap_vals, top_features, explanation_text
+
+
+async def _explanation(key, property_input: PropertyInput, X=None):
+    """Cached (and coalesced) SHAP explanation for one property"""
+    return await model_manager.explain_cache.get_or_compute(
+        key, lambda: model_manager.run_blocking(_explain_property, property_input, X)
+    )
+
+
+def _explanation_body(result) -> dict:
+    shap_vals, top_features, explanation_text = result
+
+    return {
+        "shap_values": shap_vals,
+        "feature_importance": {f["feature"]: f["importance"] for f in top_features},
+        "explanation_text": explanation_text,
+        "top_features": top_features
+    }
+
+
+@app.post("/explain", response_model=None, responses={200: {"model": ExplainabilityResponse}},
+          openapi_extra=json_body(PropertyInput))
+async def explain_prediction(request: Request):
+    property_input = parse_body(PropertyInput, await request.body())
     if not model_manager.is_ready():
         raise HTTPException(status_code=503, detail="Models not loaded")
 
     try:
-        df = pd.DataFrame([property_input.dict()])
-        df_processed = model_manager.preprocessor.process_housing_data(df)
-
-        if "price" in df_processed.columns:
-            df_processed = df_processed.drop(columns=["price"])
+        result = await _explanation(input_key(property_input), property_input)
+        return ORJSONResponse(_explanation_body(result))
+    except ExplanationUnavailable as e:
+        logger.warning("⚠️  Explain unavailable: %s", e)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("Explain error: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        X = model_manager.preprocessor.scaler.transform(df_processed)
 
-        shap_vals = model_manager.explainability.explain_prediction_shap(X[0])
-        importance = model_manager.explainability.get_global_feature_importance(X)
-        explanation_text = model_manager.explainability.generate_explanation_text(
-            shap_vals, df_processed.columns.tolist()
-        )
-
-        top_features = [
-            {"feature": feat, "importance": float(imp)}
-            for feat, imp in list(importance.items())[:5]
-        ]
+@app.post("/predict_and_explain", response_model=None,
+          responses={200: {"model": PredictionExplanationResponse}},
+          openapi_extra=json_body(PropertyInput))
+async def predict_and_explain(request: Request):
+    """/predict and /explain in one round-trip, sharing a single feature row"""
+    property_input = parse_body(PropertyInput, await request.body())
+    if not model_manager.is_ready():
+        raise HTTPException(status_code=503, detail="Models not loaded")
 
-        return ExplainabilityResponse(
-            shap_values=shap_vals,
-            feature_importance=importance,
-            explanation_text=explanation_text,
-            top_features=top_features
+    try:
+        key = input_key(property_input)
+        X = model_manager.transform_input(property_input)
+        prediction, result = await asyncio.gather(
+            _predicted_price(key, property_input, X),
+            _explanation(key, property_input, X)
         )
+        return ORJSONResponse({
+            **_prediction_body(prediction, property_input.area),
+            **_explanation_body(result)
+        })
+    except ExplanationUnavailable as e:
+        logger.warning("⚠️  Predict+explain unavailable: %s", e)
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        logger.error(f"Explain error: {e}", exc_info=True)
+        logger.error("Predict+explain error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/chat", response_model=ChatResponse)
+def prefetch_explain(key, property_input: PropertyInput):
+    """
+    Warm the /explain cache for a property that was just priced, since the UI
+    usually asks for its explanation next. Skipped while SHAP has not been used
+    yet (keeps it lazy), on a cache hit, or when all prefetch slots are busy.
+    """
+    manager = model_manager
+    if (not manager.prefetch_explain or manager._explainability is None
+            or manager.prefetch_slots.locked()
+            or manager.explain_cache.get(key) is not None):
+        return
+    task = asyncio.create_task(_warm_explain(key, property_input))
+    manager._prefetch_tasks.add(task)
+    task.add_done_callback(manager._prefetch_tasks.discard)
+
+
+async def _warm_explain(key, property_input: PropertyInput):
+    async with model_manager.prefetch_slots:
+        try:
+            await _explanation(key, property_input)
+        except Exception as e:
+            logger.warning("⚠️  Explain prefetch failed: %s", e)
+
+
+@app.post("/chat", response_model=None, responses={200: {"model": ChatResponse}})
 async def chat(req: ChatRequest):
-    if not model_manager.chatbot:
+    # First access imports LangChain and builds the chain; keep that off the loop
+    chatbot = await asyncio.to_thread(lambda: model_manager.chatbot)
+    if not chatbot:
         raise HTTPException(status_code=503, detail="Chatbot unavailable")
 
     try:
         if req.context:
-            model_manager.chatbot.set_property_context(
+            chatbot.set_property_context(
                 req.context.get("property", {}),
                 req.context.get("analysis", {})
             )
-        response = model_manager.chatbot.chat(req.message)
-        return ChatResponse(response=response, context_used=req.context is not None)
+        response = await chatbot.achat(req.message)
+        return ORJSONResponse({"response": response, "context_used": req.context is not None})
     except Exception as e:
-        logger.error(f"Chat error: {e}", exc_info=True)
+        logger.error("Chat error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/chat/reset")
 async def reset_chat():
-    if model_manager.chatbot:
-        model_manager.chatbot.reset_conversation()
+    model_manager.reset_chat()
     return {"status": "success"}
 
 
@@ -559,6 +1400,14 @@ async def reset_chat():
 @app.on_event("startup")
 async def startup_event():
     logger.info("🚀 Starting Real Estate Investment Advisor API...")
+    batch_predictor.start()
+    app.state.clock_task = asyncio.create_task(model_manager.tick_clock())
+
+    if model_manager.allow_startup_without_models:
+        # Bind immediately; /ready and the model endpoints return 503 until loaded
+        app.state.load_task = asyncio.create_task(_load_models_in_background())
+        return
+
     try:
         ok = model_manager.load_all_models()
         if ok:
@@ -566,15 +1415,44 @@ async def startup_event():
         else:
             logger.warning("⚠️  API started without models")
     except Exception as e:
-        logger.error(f"❌ Startup failed: {e}", exc_info=True)
+        logger.error("❌ Startup failed: %s", e, exc_info=True)
         raise
 
 
+async def _load_models_in_background():
+    logger.info("⏳ Loading models in the background...")
+    ok = await asyncio.to_thread(model_manager.load_all_models)
+    if ok:
+        logger.info("✅ API ready with models loaded")
+    else:
+        logger.warning("⚠️  API running without models")
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("🛑 API shutting down...")
+    await batch_predictor.stop()
+    app.state.clock_task.cancel()
+
+    load_task = getattr(app.state, "load_task", None)
+    if load_task is not None and not load_task.done():
+        try:
+            await asyncio.wait_for(load_task, timeout=5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            logger.warning("⚠️  Model loading still running at shutdown")
+    model_manager.executor.shutdown(wait=False)
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
+    # Multiple workers need an import string rather than the app object
+    uvicorn.run(
+        "main:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8080")),
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        workers=int(os.getenv("WEB_CONCURRENCY", "2"))
+    )
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+Model artifact download from GCS, shared by the API's ModelManager and the
+Docker image bake step. Kept free of FastAPI/numpy so the bake step only
+pays for the GCS client.
+"""
+
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def gcs_client(download_workers=8):
+    """Storage client with a keep-alive pool sized for the concurrent download workers"""
+    from google.cloud import storage
+    from requests.adapters import HTTPAdapter
+
+    client = storage.Client()
+    pool_size = max(download_workers, 10)
+    client._http.mount(
+        "https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    )
+    return client
+
+
+def download_models(client, bucket_name, gcs_model_path, local_model_path,
+                    download_workers=8, chunk_size=8 * 1024 * 1024,
+                    sliced_threshold=32 * 1024 * 1024, verify_checksums=True) -> bool:
+    """Download model artifacts that changed since the last download; True if any were fetched"""
+    try:
+        logger.info("📥 Downloading models from gs://%s/%s", bucket_name, gcs_model_path)
+        from google.cloud.storage import transfer_manager
+
+        bucket = client.bucket(bucket_name)
+
+        os.makedirs(local_model_path, exist_ok=True)
+
+        # Manifest of blob generations already on disk: unchanged blobs are skipped,
+        # so a reload only transfers artifacts that were re-uploaded
+        manifest_path = os.path.join(local_model_path, ".manifest.json")
+        manifest = {}
+        if os.path.exists(manifest_path):
+            manifest = orjson.loads(Path(manifest_path).read_bytes())
+
+        listed = 0
+        blob_file_pairs = []
+        for blob in bucket.list_blobs(prefix=gcs_model_path):
+            if blob.name.endswith('/'):
+                continue
+            listed += 1
+            local_file = os.path.join(local_model_path, os.path.basename(blob.name))
+            if manifest.get(blob.name) == blob.generation and os.path.exists(local_file):
+                continue
+            # Download beside the target and rename into place afterwards: the
+            # live model memory-maps these files, and rewriting them in place
+            # would truncate its maps (SIGBUS) mid-reload
+            blob_file_pairs.append((blob, local_file + ".part"))
+
+        if not listed:
+            logger.warning("❌ No model files found in gs://%s/%s", bucket_name, gcs_model_path)
+            return False
+
+        if not blob_file_pairs:
+            logger.info("📦 All %s model files up to date, nothing to download", listed)
+            return True
+
+        # Stream each blob straight to disk in large chunks (chunk_size must be
+        # a multiple of 256 KiB); raw_download skips decompressive transcoding
+        for blob, _ in blob_file_pairs:
+            blob.chunk_size = chunk_size
+
+        # Big pickles are fetched as concurrent byte-range slices; everything
+        # else goes through one parallel download_many call
+        large = [(b, f) for b, f in blob_file_pairs if (b.size or 0) >= sliced_threshold]
+        small = [(b, f) for b, f in blob_file_pairs if (b.size or 0) < sliced_threshold]
+
+        # Failures are collected per blob, not raised, so the download stays best-effort
+        start = time.perf_counter()
+        results = []
+        for blob, local_file in large:
+            try:
+                transfer_manager.download_chunks_concurrently(
+                    blob, local_file,
+                    chunk_size=chunk_size * 2,
+                    max_workers=download_workers,
+                    worker_type=transfer_manager.THREAD
+                )
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+
+        if small:
+            download_kwargs = {"raw_download": True}
+            if not verify_checksums:
+                download_kwargs["checksum"] = None
+            results.extend(transfer_manager.download_many(
+                small,
+                download_kwargs=download_kwargs,
+                max_workers=min(download_workers, len(small)),
+                worker_type=transfer_manager.THREAD
+            ))
+        blob_file_pairs = large + small
+        elapsed = time.perf_counter() - start
+
+        downloaded_count = 0
+        downloaded_bytes = 0
+        for (blob, part_file), result in zip(blob_file_pairs, results):
+            local_file = part_file[:-len(".part")]
+            if isinstance(result, Exception):
+                logger.error("❌ Failed to download %s: %s", blob.name, result)
+                manifest.pop(blob.name, None)
+                if os.path.exists(part_file):
+                    os.remove(part_file)
+            else:
+                # New inode; existing maps keep reading the old file
+                os.replace(part_file, local_file)
+                logger.info("✅ Downloaded: %s → %s", blob.name, local_file)
+                downloaded_count += 1
+                downloaded_bytes += blob.size or 0
+                manifest[blob.name] = blob.generation
+
+        # Write-then-rename so a crash never leaves a half-written manifest
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(manifest))
+        os.replace(tmp_path, manifest_path)
+
+        mb = downloaded_bytes / (1024 * 1024)
+        logger.info(
+            "📦 Downloaded %d of %d files from GCS (%.1f MB in %.2fs, %.1f MB/s)",
+            downloaded_count, listed, mb, elapsed, mb / max(elapsed, 1e-6)
+        )
+        return downloaded_count > 0
+
+    except Exception as e:
+        logger.error("❌ Error downloading from GCS: %s", e, exc_info=True)
+        return False
+
+
+def download_from_env() -> bool:
+    """Download using the same GCS_* / LOCAL_MODEL_PATH settings as the API"""
+    bucket_name = os.getenv('GCS_BUCKET_NAME')
+    if not bucket_name:
+        logger.warning("GCS_BUCKET_NAME not set, skipping GCS download")
+        return False
+    download_workers = int(os.getenv('GCS_DOWNLOAD_WORKERS', '8'))
+    try:
+        client = gcs_client(download_workers)
+    except Exception as e:
+        logger.error("❌ Error downloading from GCS: %s", e, exc_info=True)
+        return False
+    return download_models(
+        client, bucket_name,
+        os.getenv('GCS_MODEL_PATH', 'models/latest'),
+        os.getenv('LOCAL_MODEL_PATH', '/app/models/saved_models'),
+        download_workers=download_workers,
+        chunk_size=int(os.getenv('GCS_CHUNK_SIZE_MB', '8')) * 1024 * 1024,
+        sliced_threshold=int(os.getenv('GCS_SLICED_DOWNLOAD_MB', '32')) * 1024 * 1024,
+        verify_checksums=os.getenv('GCS_VERIFY_CHECKSUM', 'true').lower() == 'true'
+    )
+
+
+if __name__ == "__main__":
+    # Image bake step: fetch the artifacts without building the FastAPI app
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
+    sys.exit(0 if download_from_env() else 1)
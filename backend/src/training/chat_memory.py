@@ -0,0 +1,120 @@
+# src/chat_memory.py
+
+import asyncio
+from typing import Any
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain.pydantic_v1 import PrivateAttr
+from langchain.schema import HumanMessage, SystemMessage
+
+
+class WindowedSummaryMemory(BaseChatMemory):
+    """
+    Chat memory that keeps the last `k` exchanges verbatim and folds older
+    ones into a short rolling summary, so the prompt stops growing with the
+    conversation. Summaries are produced by the LLM in the background when
+    an event loop is running, otherwise inline.
+    """
+    
+    llm: Any
+    k: int = 6
+    max_token_limit: int = 512
+    summary_max_tokens: int = 150
+    memory_key: str = "chat_history"
+    summary: str = ""
+    
+    _evicted: list = PrivateAttr(default_factory=list)
+    _summary_task: Any = PrivateAttr(default=None)
+    # Bumped by clear() so a summary in flight can't restore the old conversation
+    _generation: int = PrivateAttr(default=0)
+    
+    @property
+    def memory_variables(self):
+        return [self.memory_key]
+    
+    @staticmethod
+    def _count_tokens(text):
+        """Rough token estimate (~4 characters per token)"""
+        return len(text) // 4 + 1
+    
+    def load_memory_variables(self, inputs):
+        messages = list(self.chat_memory.messages)
+        if self.summary:
+            messages.insert(0, SystemMessage(content=f"Summary of the earlier conversation: {self.summary}"))
+        return {self.memory_key: messages}
+    
+    def save_context(self, inputs, outputs):
+        super().save_context(inputs, outputs)
+        self._prune()
+    
+    def clear(self):
+        super().clear()
+        self._generation += 1
+        if self._summary_task is not None and not self._summary_task.done():
+            self._summary_task.cancel()
+        self._summary_task = None
+        self.summary = ""
+        self._evicted = []
+    
+    def _prune(self):
+        """Move exchanges outside the window or token budget to the summarizer"""
+        messages = self.chat_memory.messages
+        budget = self.max_token_limit // 2
+        while len(messages) > 2 and (
+            len(messages) > 2 * self.k
+            or sum(self._count_tokens(m.content) for m in messages) > budget
+        ):
+            self._evicted.extend(messages[:2])
+            del messages[:2]
+        
+        if not self._evicted:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._summarize()
+            return
+        if self._summary_task is None or self._summary_task.done():
+            self._summary_task = loop.create_task(self._asummarize())
+    
+    def _summary_prompt(self, messages):
+        """Build the summarizer prompt from a batch of evicted messages"""
+        lines = "\n".join(f"{m.type}: {m.content}" for m in messages)
+        words = self.summary_max_tokens * 3 // 4
+        return [HumanMessage(content=(
+            f"Update the summary of a real estate investment conversation in at most {words} words. "
+            f"Keep figures, property details and the user's goals.\n\n"
+            f"Current summary: {self.summary or '(none)'}\n\nNew messages:\n{lines}\n\nUpdated summary:"
+        ))]
+    
+    def _set_summary(self, text):
+        """Store the summary, truncated to the token cap so it cannot grow"""
+        self.summary = text.strip()[:self.summary_max_tokens * 4]
+    
+    def _summarized(self, batch, text):
+        """Store a new summary and drop the evicted messages it covers"""
+        self._set_summary(text)
+        del self._evicted[:len(batch)]
+    
+    def _summarize(self):
+        # Evicted messages stay queued until a summary succeeds, so a Groq
+        # error only delays them to the next prune
+        batch = list(self._evicted)
+        try:
+            self._summarized(batch, self.llm.invoke(self._summary_prompt(batch)).content)
+        except Exception as e:
+            print(f"Could not summarize chat history ({len(batch)} messages kept): {e}")
+    
+    async def _asummarize(self):
+        # Loop so exchanges evicted while a summary was in flight get folded in too
+        generation = self._generation
+        while self._evicted:
+            batch = list(self._evicted)
+            try:
+                response = await self.llm.ainvoke(self._summary_prompt(batch))
+            except Exception as e:
+                print(f"Could not summarize chat history ({len(batch)} messages kept): {e}")
+                return
+            if generation != self._generation:
+                # clear() ran while waiting: don't bring the old conversation back
+                return
+            self._summarized(batch, response.content)
@@ -1,59 +1,22 @@
 # src/chatbot.py
 
 import os
-from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import ConversationChain
-from langchain.schema import HumanMessage, AIMessage
+import json
+import asyncio
+import threading
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
 
-load_dotenv()
+# LangChain, Groq and dotenv are imported when a chatbot is created (or a
+# prompt is first built), so importing this module stays cheap
 
-class RealEstateInvestmentChatbot:
-    """
-    Conversational AI Assistant for Real Estate Investment Guidance
-    Powered by LangChain and Groq Cloud LLM
-    """
-    
-    def __init__(self, api_key=None):
-        """Initialize the chatbot with Groq LLM"""
-        
-        if api_key is None:
-            api_key = os.getenv('GROQ_API_KEY')
-        
-        if not api_key:
-            raise ValueError("GROQ_API_KEY not found. Please set it in .env file")
-        
-        # Initialize Groq LLM
-        self.llm = ChatGroq(
-            temperature=0.7,
-            model_name="llama-3.3-70b-versatile",  # or "llama2-70b-4096"
-            groq_api_key=api_key
-        )
-        
-        # Initialize conversation memory
-        self.memory = ConversationBufferMemory(
-            return_messages=True,
-            memory_key="chat_history"
-        )
-        
-        # Create system prompt
-        self.system_prompt = self._create_system_prompt()
-        
-        # Initialize conversation chain
-        self.conversation = self._initialize_conversation_chain()
-        
-        # Store context
-        self.context = {
-            'current_property': None,
-            'analysis_results': None,
-            'user_preferences': {}
-        }
-    
-    def _create_system_prompt(self):
-        """Create comprehensive system prompt for the assistant"""
-        return """You are an expert Real Estate Investment Advisor AI Assistant. Your role is to help investors make informed decisions about property investments.
+# Static on purpose: it is sent verbatim as the first message of every
+# request, so Groq can reuse the cached prefix across turns and users.
+# Per-instance or per-request data belongs in the user message (see
+# _build_message), never interpolated here.
+SYSTEM_PROMPT = """You are an expert Real Estate Investment Advisor AI Assistant. Your role is to help investors make informed decisions about property investments.
 
 Your capabilities include:
 1. Analyzing property investment opportunities
@@ -84,135 +47,393 @@ When you have analysis results (ROI, rental yield, etc.), use those specific val
 
 Remember: You're here to educate and guide, not to make final decisions for users."""
 
-    def _initialize_conversation_chain(self):
-        """Initialize the conversation chain with memory"""
+
+@lru_cache(maxsize=None)
+def system_message():
+    """The system prompt as a ready-made message, shared by every request"""
+    from langchain.schema import SystemMessage
+    
+    return SystemMessage(content=SYSTEM_PROMPT)
+
+
+@lru_cache(maxsize=None)
+def chat_prompt():
+    """Chat prompt template, built once for all instances"""
+    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+    
+    # A message instance is passed through as-is instead of being re-rendered
+    # as a template on every call
+    return ChatPromptTemplate.from_messages([
+        system_message(),
+        MessagesPlaceholder(variable_name="chat_history"),
+        ("human", "{input}")
+    ])
+
+
+class RealEstateInvestmentChatbot:
+    """
+    Conversational AI Assistant for Real Estate Investment Guidance
+    Powered by LangChain and Groq Cloud LLM
+    """
+    
+    def __init__(self, api_key=None):
+        """Initialize the chatbot with Groq LLM"""
+        from dotenv import load_dotenv
+        from langchain_groq import ChatGroq
+        from chat_memory import WindowedSummaryMemory
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", self.system_prompt),
-            MessagesPlaceholder(variable_name="chat_history"),
-            ("human", "{input}")
-        ])
+        load_dotenv()
+        
+        if api_key is None:
+            api_key = os.getenv('GROQ_API_KEY')
+        
+        if not api_key:
+            raise ValueError("GROQ_API_KEY not found. Please set it in .env file")
+        
+        # Initialize Groq LLM
+        self.llm = ChatGroq(
+            temperature=0.7,
+            model_name="llama-3.3-70b-versatile",  # or "llama2-70b-4096"
+            groq_api_key=api_key
+        )
         
-        conversation = ConversationChain(
+        # Initialize conversation memory: recent turns verbatim plus a rolling
+        # summary, bounded by half of the response token budget
+        max_tokens = int(os.getenv('CHATBOT_MAX_TOKENS', '1024'))
+        self.memory = WindowedSummaryMemory(
             llm=self.llm,
-            memory=self.memory,
-            prompt=prompt,
-            verbose=False
+            return_messages=True,
+            memory_key="chat_history",
+            max_token_limit=max_tokens
         )
         
-        return conversation
+        # Static system prompt, shared by all instances
+        self.system_prompt = SYSTEM_PROMPT
+        
+        # Store context
+        self.context = {
+            'current_property': None,
+            'analysis_results': None,
+            'user_preferences': {}
+        }
+        
+        # Formatted context summary, rebuilt only when the context changes
+        self._ctx_version = 0
+        self._ctx_cache = (-1, "")
+        
+        # Cap on concurrent Groq requests issued by chat_batch()
+        self.max_concurrency = max(1, int(os.getenv('CHATBOT_MAX_CONCURRENCY', '4')))
+        
+        # LRU of answers keyed on the exact message (context included), the
+        # conversation history and the context version, so repeated questions
+        # skip the Groq round trip
+        self.response_cache_size = max(0, int(os.getenv('CHATBOT_CACHE_SIZE', '256')))
+        self._response_cache = OrderedDict()
+        
+        # One turn at a time per conversation: a turn reads the history, waits
+        # for Groq and saves the exchange, so overlapping turns would each miss
+        # the other and be stored out of order
+        self._turn_lock = threading.Lock()
+        self._aturn_lock = asyncio.Lock()
     
     def set_property_context(self, property_data, analysis_results=None):
         """
         Set context about the current property being discussed
         """
+        if (property_data == self.context['current_property']
+                and analysis_results == self.context['analysis_results']):
+            return
         self.context['current_property'] = property_data
         self.context['analysis_results'] = analysis_results
+        self._ctx_version += 1
+    
+    @staticmethod
+    def _format_pairs(pairs):
+        """Render (key, value, decimals) triples as compact k=v;... text, skipping missing values"""
+        parts = []
+        for key, value, decimals in pairs:
+            if value is None or value == '':
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = f"{value:.{decimals}f}"
+            parts.append(f"{key}={value}")
+        return ";".join(parts)
     
     def get_context_summary(self):
-        """Generate a summary of current context"""
+        """Generate a compact key=value summary of current context (cached per context version)"""
+        version, text = self._ctx_cache
+        if version == self._ctx_version:
+            return text
+        
         summary_parts = []
         
-        if self.context.get('current_property'):
-            prop = self.context['current_property']
-            summary_parts.append("Current Property Information:")
-            summary_parts.append(f"- Price: ₹{prop.get('price', 'N/A'):,.0f}" if isinstance(prop.get('price'), (int, float)) else f"- Price: {prop.get('price', 'N/A')}")
-            if prop.get('area'):
-                summary_parts.append(f"- Area: {prop.get('area')} sq ft")
-            if prop.get('bedrooms'):
-                summary_parts.append(f"- Bedrooms: {prop.get('bedrooms')}")
-            if prop.get('bathrooms'):
-                summary_parts.append(f"- Bathrooms: {prop.get('bathrooms')}")
-            if prop.get('location'):
-                summary_parts.append(f"- Location: {prop.get('location')}")
-            if prop.get('furnishing'):
-                summary_parts.append(f"- Furnishing: {prop.get('furnishing')}")
+        prop = self.context.get('current_property')
+        if prop:
+            summary_parts.append("property: " + self._format_pairs((
+                ('price', prop.get('price', 'N/A'), 0),
+                ('area_sqft', prop.get('area') or None, 0),
+                ('bedrooms', prop.get('bedrooms') or None, 0),
+                ('bathrooms', prop.get('bathrooms') or None, 0),
+                ('location', prop.get('location'), 0),
+                ('furnishing', prop.get('furnishing'), 0),
+            )))
         
-        if self.context.get('analysis_results'):
-            analysis = self.context['analysis_results']
-            summary_parts.append("\nInvestment Analysis Results:")
-            
+        analysis = self.context.get('analysis_results')
+        if analysis:
+            pairs = []
             if 'roi' in analysis:
-                roi_pct = analysis['roi']['roi_percentage']
-                net_profit = analysis['roi']['net_profit']
-                summary_parts.append(f"- ROI: {roi_pct:.2f}% (Net Profit: ₹{net_profit:,.0f})")
-            
+                pairs += [('roi_pct', analysis['roi']['roi_percentage'], 2),
+                          ('net_profit', analysis['roi']['net_profit'], 0)]
             if 'rental_yield' in analysis:
-                yield_pct = analysis['rental_yield']['net_yield_percentage']
-                annual_income = analysis['rental_yield']['net_annual_income']
-                summary_parts.append(f"- Net Rental Yield: {yield_pct:.2f}% (₹{annual_income:,.0f}/year)")
-            
+                pairs += [('net_yield_pct', analysis['rental_yield']['net_yield_percentage'], 2),
+                          ('net_income_yr', analysis['rental_yield']['net_annual_income'], 0)]
             if 'cap_rate' in analysis:
-                cap_rate = analysis['cap_rate']['cap_rate_percentage']
-                summary_parts.append(f"- Cap Rate: {cap_rate:.2f}%")
-            
+                pairs.append(('cap_rate_pct', analysis['cap_rate']['cap_rate_percentage'], 2))
             if 'cash_flow' in analysis:
-                annual_cf = analysis['cash_flow']['annual_cash_flow']
-                monthly_cf = analysis['cash_flow']['monthly_cash_flow']
-                summary_parts.append(f"- Cash Flow: ₹{annual_cf:,.0f}/year (₹{monthly_cf:,.0f}/month)")
+                pairs += [('cash_flow_yr', analysis['cash_flow']['annual_cash_flow'], 0),
+                          ('cash_flow_mo', analysis['cash_flow']['monthly_cash_flow'], 0)]
+            summary_parts.append("analysis: " + self._format_pairs(pairs))
+        
+        text = "\n".join(summary_parts)
+        self._ctx_cache = (self._ctx_version, text)
+        return text
+    
+    def _build_message(self, user_message):
+        """Append the current context summary to the user message, if any"""
+        context_info = self.get_context_summary()
         
-        return "\n".join(summary_parts) if summary_parts else ""
+        if context_info:
+            return f"{user_message}\n\n[Context (INR, key=value):\n{context_info}]"
+        return user_message
+    
+    def _history(self):
+        """Conversation history (summary + recent turns) as sent to the LLM"""
+        return self.memory.load_memory_variables({})[self.memory.memory_key]
+    
+    def _prompt_messages(self, message, history=None):
+        """Format the cached prompt with the conversation history and the message"""
+        if history is None:
+            history = self._history()
+        return chat_prompt().format_messages(chat_history=history, input=message)
+    
+    def _cache_key(self, message, history):
+        """
+        Response cache key: the message plus a digest of the history it is
+        asked in, so follow-ups ("why?") never replay another conversation
+        """
+        digest = hashlib.sha1()
+        for past in history:
+            digest.update(past.type.encode('utf-8'))
+            digest.update(b'\0')
+            digest.update(past.content.encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(message.encode('utf-8'))
+        return digest.digest(), self._ctx_version
+    
+    def _cached_response(self, key):
+        """Cached answer for key (marked most recently used), or None"""
+        response = self._response_cache.get(key)
+        if response is not None:
+            self._response_cache.move_to_end(key)
+        return response
+    
+    def _cache_response(self, key, response):
+        if not self.response_cache_size:
+            return
+        self._response_cache[key] = response
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > self.response_cache_size:
+            self._response_cache.popitem(last=False)
     
     def chat(self, user_message):
         """
         Process user message and return AI response with context
         """
         try:
-            # Get context summary
-            context_info = self.get_context_summary()
-            
-            # Enhance message with context if available
-            if context_info:
-                enhanced_message = f"{user_message}\n\n[Context Information:\n{context_info}]"
-            else:
-                enhanced_message = user_message
-            
-            # Get response from LLM
-            response = self.conversation.predict(input=enhanced_message)
+            with self._turn_lock:
+                message = self._build_message(user_message)
+                history = self._history()
+                key = self._cache_key(message, history)
+                response = self._cached_response(key)
+                
+                if response is None:
+                    # Get response from LLM
+                    response = self.llm.invoke(self._prompt_messages(message, history)).content
+                    self._cache_response(key, response)
+                self.memory.save_context({'input': message}, {'response': response})
             
             return response
         
         except Exception as e:
             return f"I apologize, but I encountered an error: {str(e)}. Please try rephrasing your question."
     
+    def chat_stream(self, user_message):
+        """
+        Streaming version of chat(): yields response text as Groq produces it
+        and records the full exchange in memory once the stream completes
+        """
+        try:
+            with self._turn_lock:
+                message = self._build_message(user_message)
+                history = self._history()
+                key = self._cache_key(message, history)
+                response = self._cached_response(key)
+                
+                if response is not None:
+                    yield response
+                else:
+                    parts = []
+                    for chunk in self.llm.stream(self._prompt_messages(message, history)):
+                        parts.append(chunk.content)
+                        yield chunk.content
+                    response = "".join(parts)
+                    self._cache_response(key, response)
+                self.memory.save_context({'input': message}, {'response': response})
+        
+        except Exception as e:
+            yield f"I apologize, but I encountered an error: {str(e)}. Please try rephrasing your question."
+    
+    async def achat(self, user_message):
+        """
+        Async version of chat() for the API: awaits Groq through the LLM's
+        async client (reused across calls) instead of blocking a thread
+        """
+        try:
+            async with self._aturn_lock:
+                message = self._build_message(user_message)
+                history = self._history()
+                key = self._cache_key(message, history)
+                response = self._cached_response(key)
+                
+                if response is None:
+                    response = (await self.llm.ainvoke(self._prompt_messages(message, history))).content
+                    self._cache_response(key, response)
+                self.memory.save_context({'input': message}, {'response': response})
+            return response
+        
+        except Exception as e:
+            return f"I apologize, but I encountered an error: {str(e)}. Please try rephrasing your question."
+    
+    async def _acomplete(self, user_message, semaphore):
+        """
+        One-shot completion for chat_batch(): system prompt + context, no
+        conversation memory, so independent prompts can run concurrently
+        """
+        from langchain.schema import HumanMessage
+        
+        messages = [
+            system_message(),
+            HumanMessage(content=self._build_message(user_message))
+        ]
+        try:
+            async with semaphore:
+                response = await self.llm.ainvoke(messages)
+            return response.content
+        
+        except Exception as e:
+            return f"I apologize, but I encountered an error: {str(e)}. Please try rephrasing your question."
+    
+    async def chat_batch(self, messages):
+        """
+        Answer several independent messages concurrently (at most
+        max_concurrency in flight). Responses are returned in input order.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return list(await asyncio.gather(
+            *(self._acomplete(message, semaphore) for message in messages)
+        ))
+    
     def _enhance_message_with_context(self, user_message):
         """
         Add relevant context to user message (deprecated - now using get_context_summary)
         """
         return user_message
     
-    def explain_prediction(self, property_features, predicted_price, explanation_data):
-        """
-        Generate explanation for a price prediction
-        """
-        explanation_text = f"""
-The predicted price for this property is ${predicted_price:,.2f}.
-
-Here are the key factors influencing this prediction:
-
-"""
+    def _explanation_message(self, property_features, predicted_price, explanation_data):
+        """Build the prediction explanation prompt"""
+        parts = [
+            "Please explain this property price prediction in simple terms:",
+            "",
+            f"The predicted price for this property is ${predicted_price:,.2f}.",
+            "",
+            "Here are the key factors influencing this prediction:",
+            "",
+        ]
         
         if explanation_data and isinstance(explanation_data, dict):
-            for i, (feature, data) in enumerate(list(explanation_data.items())[:5], 1):
+            for i, (feature, data) in enumerate(islice(explanation_data.items(), 5), 1):
                 if isinstance(data, dict) and 'shap_value' in data:
                     impact = data['shap_value']
                     value = data['feature_value']
                     direction = "increases" if impact > 0 else "decreases"
-                    explanation_text += f"{i}. {feature} ({value:.2f}): {direction} price by ${abs(impact):,.2f}\n"
-        
-        message = f"Please explain this property price prediction in simple terms:\n{explanation_text}"
+                    parts.append(f"{i}. {feature} ({value:.2f}): {direction} price by ${abs(impact):,.2f}")
         
-        return self.chat(message)
+        parts.append("")
+        return "\n".join(parts)
     
-    def get_investment_advice(self, analysis_results):
+    def explain_prediction(self, property_features, predicted_price, explanation_data):
         """
-        Get personalized investment advice based on analysis
+        Generate explanation for a price prediction
         """
+        return self.chat(self._explanation_message(property_features, predicted_price, explanation_data))
+    
+    def explain_predictions_batch(self, X, prices, shap_values, top_k=5):
+        """
+        Explain many predictions with a single LLM call.
+        X is the feature DataFrame, prices the predicted prices and
+        shap_values the matching (n_rows, n_features) matrix; compute it
+        upstream with one explainer.shap_values(X) call rather than per row.
+        Returns one explanation string per row, in row order.
+        """
+        import numpy as np
+        from langchain.schema import HumanMessage
+        
+        values = X.to_numpy()
+        shap_values = np.asarray(shap_values)
+        top_k = min(top_k, shap_values.shape[1])
+        top = np.argsort(-np.abs(shap_values), axis=1)[:, :top_k]
+        columns = list(X.columns)
+        
+        rows = [
+            {
+                'row': i,
+                'price': round(float(prices[i]), 2),
+                'factors': [[columns[j], round(float(values[i, j]), 2), round(float(shap_values[i, j]), 2)]
+                            for j in top[i]]
+            }
+            for i in range(len(values))
+        ]
+        message = (
+            "Explain each of these property price predictions in two or three simple sentences. "
+            "Each factor is [feature, value, impact on price]. "
+            'Reply with JSON only: {"explanations": [{"row": <row>, "explanation": "<text>"}]}\n'
+            + json.dumps(rows, separators=(',', ':'))
+        )
+        
+        try:
+            llm = self.llm.bind(response_format={"type": "json_object"})
+            response = llm.invoke([
+                system_message(),
+                HumanMessage(content=message)
+            ])
+            explanations = [""] * len(rows)
+            for item in json.loads(response.content).get('explanations', []):
+                row = item.get('row')
+                if isinstance(row, int) and 0 <= row < len(rows):
+                    explanations[row] = item.get('explanation', "")
+            return explanations
+        
+        except Exception as e:
+            error = f"I apologize, but I encountered an error: {str(e)}. Please try rephrasing your question."
+            return [error] * len(rows)
+    
+    def _advice_message(self, analysis_results):
+        """Build the investment advice prompt"""
         roi = analysis_results['roi']['roi_percentage']
         rental_yield = analysis_results['rental_yield']['net_yield_percentage']
         cash_flow = analysis_results['cash_flow']['annual_cash_flow']
         
-        message = f"""
+        return f"""
 Based on the investment analysis:
 - ROI: {roi:.2f}%
 - Rental Yield: {rental_yield:.2f}%
@@ -220,8 +441,23 @@ Based on the investment analysis:
 
 Should I invest in this property? What are the key considerations?
 """
-        
-        return self.chat(message)
+    
+    def get_investment_advice(self, analysis_results):
+        """
+        Get personalized investment advice based on analysis
+        """
+        return self.chat(self._advice_message(analysis_results))
+    
+    async def analyze_property(self, property_features, predicted_price, explanation_data, analysis_results):
+        """
+        Explanation and investment advice for one property, requested
+        concurrently through chat_batch()
+        """
+        explanation, advice = await self.chat_batch([
+            self._explanation_message(property_features, predicted_price, explanation_data),
+            self._advice_message(analysis_results)
+        ])
+        return {'explanation': explanation, 'advice': advice}
     
     def compare_properties(self, property1_analysis, property2_analysis):
         """
@@ -253,6 +489,7 @@ Which one would be a better investment and why?
             'analysis_results': None,
             'user_preferences': {}
         }
+        self._ctx_version += 1
     
     def get_conversation_history(self):
         """Get the conversation history"""
@@ -276,8 +513,10 @@ if __name__ == "__main__":
                 print("Assistant: Thank you for using the Real Estate Investment Assistant. Good luck with your investments!")
                 break
             
-            response = chatbot.chat(user_input)
-            print(f"\nAssistant: {response}\n")
+            print("\nAssistant: ", end="", flush=True)
+            for token in chatbot.chat_stream(user_input):
+                print(token, end="", flush=True)
+            print("\n")
     
     except ValueError as e:
         print(f"Error: {e}")
@@ -16,10 +16,16 @@ MODELS_DIR = PROJECT_ROOT / "models"
 SAVED_MODELS_DIR = MODELS_DIR / "saved_models"
 EXPLAINABILITY_DIR = MODELS_DIR / "explainability"
 
-# Create directories if they don't exist
-for directory in [DATA_DIR, RAW_DATA_DIR, PROCESSED_DATA_DIR, 
-                  MODELS_DIR, SAVED_MODELS_DIR, EXPLAINABILITY_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+
+def ensure_dirs():
+    """
+    Create the project data/model directories if they don't exist
+    Call once at startup; importing this module has no side effects
+    """
+    for directory in [DATA_DIR, RAW_DATA_DIR, PROCESSED_DATA_DIR, 
+                      MODELS_DIR, SAVED_MODELS_DIR, EXPLAINABILITY_DIR]:
+        directory.mkdir(parents=True, exist_ok=True)
+
 
 # Model configuration
 MODEL_CONFIG = {
@@ -154,6 +160,7 @@ __all__ = [
     'PROJECT_ROOT',
     'DATA_DIR',
     'MODELS_DIR',
+    'ensure_dirs',
     'MODEL_CONFIG',
     'PREPROCESSING_CONFIG',
     'ANALYTICS_CONFIG',
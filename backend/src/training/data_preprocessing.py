@@ -2,9 +2,39 @@
 
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 
+# Multi-threaded CSV parsing when pyarrow is installed; pandas' C reader otherwise
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# Categorical encodings used by process_housing_data (and the API fast path)
+BINARY_COLUMNS = ['mainroad', 'guestroom', 'basement', 'hotwaterheating',
+                  'airconditioning', 'prefarea']
+YES_NO_MAP = {'yes': 1, 'no': 0}
+FURNISHING_MAP = {'furnished': 2, 'semi-furnished': 1, 'unfurnished': 0}
+CATEGORY_MAPS = {**{col: YES_NO_MAP for col in BINARY_COLUMNS},
+                 'furnishingstatus': FURNISHING_MAP}
+
+# Declared dtypes for the numeric Housing.csv columns, so the reader skips
+# type inference. Floats keep missing values readable (clean_data fills them);
+# small counts fit float32. Columns absent from a file are ignored.
+HOUSING_SCHEMA = {
+    'price': 'float64',
+    'area': 'float64',
+    'bedrooms': 'float32',
+    'bathrooms': 'float32',
+    'stories': 'float32',
+    'parking': 'float32',
+    'year_built': 'float32',
+    'parking_spaces': 'float32',
+    'amenities_score': 'float32',
+}
+
 class RealEstateDataPreprocessor:
     """Handles data loading, cleaning, and preprocessing for real estate data"""
     
@@ -12,23 +42,42 @@ class RealEstateDataPreprocessor:
         self.scaler = StandardScaler()
         self.label_encoders = {}
         self.feature_names = None
+        self._feature_cols = None
+        self._encode_plan = None
+        self._column_cache = None
         
     def load_data(self, file_path):
         """Load real estate data from CSV"""
-        df = pd.read_csv(file_path)
+        header = pd.read_csv(file_path, nrows=0).columns
+        dtype = {col: HOUSING_SCHEMA[col] for col in header if col in HOUSING_SCHEMA}
+        df = pd.read_csv(file_path, engine=CSV_ENGINE, dtype=dtype)
         print(f"Loaded {len(df)} records")
         return df
     
+    def _column_kinds(self, df):
+        """
+        (numeric columns, object columns) of df, read from df.dtypes in one pass
+        Memoized on the column names and dtypes, so unchanged layouts reuse it
+        """
+        key = (tuple(df.columns), tuple(df.dtypes))
+        cached = getattr(self, '_column_cache', None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        numeric_cols = tuple(col for col, dtype in zip(key[0], key[1])
+                             if pd.api.types.is_numeric_dtype(dtype)
+                             and not pd.api.types.is_bool_dtype(dtype))
+        object_cols = tuple(col for col, dtype in zip(key[0], key[1]) if dtype == object)
+        self._column_cache = (key, (numeric_cols, object_cols))
+        return numeric_cols, object_cols
+    
     def clean_data(self, df):
         """Clean and handle missing values"""
-        # Handle missing values
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
-        
-        # Handle categorical missing values
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        for col in categorical_cols:
-            df[col] = df[col].fillna(df[col].mode()[0])
+        # Median for numeric columns, mode for categorical ones, filled in one pass
+        numeric_cols, categorical_cols = self._column_kinds(df)
+        fill_values = df[list(numeric_cols)].median().to_dict()
+        if categorical_cols:
+            fill_values.update(df[list(categorical_cols)].mode().iloc[0].to_dict())
+        df = df.fillna(fill_values)
         
         # Remove duplicates
         df = df.drop_duplicates()
@@ -37,48 +86,78 @@ class RealEstateDataPreprocessor:
     
     def feature_engineering(self, df):
         """Create additional features for better predictions"""
-        if 'price' in df.columns and 'area' in df.columns:
-            df['price_per_sqft'] = df['price'] / df['area']
+        # Plain ndarray arithmetic (no index alignment), new columns added together
+        cols = df.columns
+        new = {}
+        
+        if 'price' in cols and 'area' in cols:
+            new['price_per_sqft'] = df['price'].to_numpy() / df['area'].to_numpy()
         
-        if 'bedrooms' in df.columns and 'bathrooms' in df.columns:
-            df['bed_bath_ratio'] = df['bedrooms'] / (df['bathrooms'] + 1)
+        if 'bedrooms' in cols and 'bathrooms' in cols:
+            new['bed_bath_ratio'] = df['bedrooms'].to_numpy() / (df['bathrooms'].to_numpy() + 1)
         
-        if 'year_built' in df.columns:
-            df['property_age'] = 2025 - df['year_built']
+        if 'year_built' in cols:
+            new['property_age'] = 2025 - df['year_built'].to_numpy()
+        
+        if new:
+            df[list(new)] = pd.DataFrame(new, index=df.index)
         
         return df
     
+    def _factorize(self, df, col):
+        """
+        Replace df[col] with integer codes (sorted, as LabelEncoder numbered them)
+        and keep the categories so label_encoders[col].take(codes) inverts it
+        """
+        codes, uniques = pd.factorize(df[col], sort=True)
+        df[col] = codes
+        self.label_encoders[col] = uniques
+    
     def encode_categorical(self, df, categorical_cols):
-        """Encode categorical variables"""
-        df_encoded = df.copy()
+        """
+        Encode categorical variables
+        Returns a new frame sharing the untouched columns with the input;
+        the input itself is not modified
+        """
+        # Shallow copy: encoded columns are replaced, never written in place
+        df_encoded = df.copy(deep=False)
         
         for col in categorical_cols:
             if col in df_encoded.columns:
-                le = LabelEncoder()
-                df_encoded[col] = le.fit_transform(df_encoded[col].astype(str))
-                self.label_encoders[col] = le
+                self._factorize(df_encoded, col)
         
         return df_encoded
     
     def prepare_features(self, df, target_col='price', test_size=0.2):
-        """Prepare features and target for modeling"""
-        df = df.copy()
+        """
+        Prepare features and target for modeling
+        The input frame is not modified (categoricals are encoded on a shallow copy)
+        """
+        df = df.copy(deep=False)
         
         # Ensure target column exists
         if target_col not in df.columns:
             raise ValueError(f"Target column '{target_col}' not found. Available: {list(df.columns)}")
         
         # Encode categorical columns
-        categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+        categorical_cols = list(self._column_kinds(df)[1])
         if target_col in categorical_cols:
             categorical_cols.remove(target_col)
         
         print(f"Encoding categorical columns: {categorical_cols}")
         for col in categorical_cols:
             if col in df.columns:
-                le = LabelEncoder()
-                df[col] = le.fit_transform(df[col].astype(str))
-                self.label_encoders[col] = le
+                uniques = self.label_encoders.get(col)
+                if uniques is not None:
+                    # Reuse the categories fitted earlier (e.g. by encode_categorical)
+                    # so codes stay consistent
+                    codes = uniques.get_indexer(df[col])
+                    if (codes == -1).any():
+                        unseen = df[col][codes == -1].unique().tolist()
+                        raise ValueError(f"Unseen labels in column '{col}': {unseen}")
+                    df[col] = codes
+                else:
+                    self._factorize(df, col)
                 print(f"  ✓ Encoded {col}")
         
         # Separate features and target
@@ -87,10 +166,18 @@ class RealEstateDataPreprocessor:
         
         # Store feature names
         self.feature_names = X.columns.tolist()
+        self._feature_cols = tuple(self.feature_names)
+        self._encode_plan = None
         
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
-        X_scaled = pd.DataFrame(X_scaled, columns=X.columns)
+        # Scale features: fit the scaler (float64 stats, kept for inference),
+        # then standardize a single float32 copy in place and wrap it as-is
+        self.scaler.fit(X)
+        X_scaled = X.to_numpy(dtype=np.float32, copy=True)
+        if self.scaler.with_mean:
+            np.subtract(X_scaled, self.scaler.mean_, out=X_scaled, casting='same_kind')
+        if self.scaler.with_std:
+            np.divide(X_scaled, self.scaler.scale_, out=X_scaled, casting='same_kind')
+        X_scaled = pd.DataFrame(X_scaled, columns=X.columns, copy=False)
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -99,59 +186,117 @@ class RealEstateDataPreprocessor:
         
         return X_train, X_test, y_train, y_test
     
+    @staticmethod
+    def _map_choices(values, mapping):
+        """
+        Lowercase and map a block of string values in a single pass.
+        Returns float codes with NaN for unknown values, one column per input column
+        """
+        codes = pd.Series(values.ravel()).str.lower().map(mapping).to_numpy()
+        return codes.reshape(values.shape)
+    
+    @staticmethod
+    def _compact_codes(codes):
+        """int8 codes when every value mapped; float32 (keeping NaN for clean_data) otherwise"""
+        if np.isnan(codes).any():
+            return codes.astype(np.float32)
+        return codes.astype(np.int8)
+    
     def process_housing_data(self, df):
         """
         Process the Housing.csv dataset with specific transformations
         Handles case-insensitive column names
+        Encoded columns are int8 (float32 where unknown values left NaN)
+        Returns a new frame; the input is left untouched
         """
-        df = df.copy()
+        # Shallow copy: renamed axis and mapped columns are replaced, not written in place
+        df = df.copy(deep=False)
         
         # Normalize column names to lowercase
         df.columns = df.columns.str.lower()
         
-        # Convert yes/no columns to binary (case-insensitive)
-        binary_columns = ['mainroad', 'guestroom', 'basement', 'hotwaterheating', 
-                         'airconditioning', 'prefarea']
-        
-        for col in binary_columns:
-            if col in df.columns:
-                # Convert to lowercase and map
-                df[col] = df[col].str.lower().map({'yes': 1, 'no': 0})
+        # Convert yes/no columns to binary (case-insensitive), all in one pass
+        binary_cols = [col for col in BINARY_COLUMNS if col in df.columns]
+        if binary_cols:
+            codes = self._map_choices(df[binary_cols].to_numpy(), YES_NO_MAP)
+            for k, col in enumerate(binary_cols):
+                df[col] = self._compact_codes(codes[:, k])
+        for col in BINARY_COLUMNS:
+            if col in binary_cols:
                 print(f"✓ Converted {col} to binary")
             else:
                 print(f"⚠️  Column '{col}' not found. Skipping...")
         
         # Map furnishing status to numeric (case-insensitive)
         if 'furnishingstatus' in df.columns:
-            df['furnishingstatus'] = df['furnishingstatus'].str.lower().map({
-                'furnished': 2,
-                'semi-furnished': 1,
-                'unfurnished': 0
-            })
+            df['furnishingstatus'] = self._compact_codes(
+                self._map_choices(df['furnishingstatus'].to_numpy(), FURNISHING_MAP)
+            )
             print(f"✓ Converted furnishingstatus to numeric")
         else:
             print(f"⚠️  Column 'furnishingstatus' not found. Skipping...")
         
         return df
     
-    def create_sample_dataset(self, n_samples=1000):
-        """Generate sample real estate dataset for testing"""
-        np.random.seed(42)
+    def transform_raw(self, feats):
+        """
+        NumPy-only inference transform for one property (no DataFrame)
+        Encodes a raw feature dict in the fitted column order and standard-scales it
+        """
+        plan = getattr(self, '_encode_plan', None)
+        if plan is None:
+            # (column, lookup table or None) per feature, built once per fitted layout.
+            # Pickles saved before _feature_cols existed fall back to feature_names
+            cols = (getattr(self, '_feature_cols', None) or self.feature_names
+                    or list(self.scaler.feature_names_in_))
+            plan = self._encode_plan = tuple((col, CATEGORY_MAPS.get(col)) for col in cols)
+        
+        buf = np.empty((1, len(plan)), dtype=np.float32)
+        row = buf[0]
+        for i, (col, mapping) in enumerate(plan):
+            value = feats[col]
+            row[i] = mapping[value.lower()] if mapping is not None else value
+        
+        if self.scaler.with_mean:
+            np.subtract(buf, self.scaler.mean_, out=buf, casting='same_kind')
+        if self.scaler.with_std:
+            np.divide(buf, self.scaler.scale_, out=buf, casting='same_kind')
+        return buf
+    
+    def create_sample_dataset(self, n_samples=1000, encoded=False):
+        """
+        Generate sample real estate dataset for testing
+        With encoded=True categoricals come out already mapped through
+        CATEGORY_MAPS (the process_housing_data layout) instead of as strings
+        """
+        rng = np.random.default_rng(42)
+        
+        def uniform(low, high):
+            return rng.random(n_samples, dtype=np.float32) * np.float32(high - low) + np.float32(low)
+        
+        def integers(low, high):
+            return rng.integers(low, high, n_samples, dtype=np.int8)
+        
+        def choice(mapping):
+            codes = integers(0, len(mapping))
+            if encoded:
+                return codes
+            return np.array(sorted(mapping, key=mapping.get))[codes]
         
         data = {
-            'price': np.random.uniform(1000000, 15000000, n_samples),
-            'area': np.random.uniform(1500, 12000, n_samples),
-            'bedrooms': np.random.randint(1, 6, n_samples),
-            'bathrooms': np.random.randint(1, 4, n_samples),
-            'stories': np.random.randint(1, 4, n_samples),
-            'mainroad': np.random.choice(['yes', 'no'], n_samples),
-            'guestroom': np.random.choice(['yes', 'no'], n_samples),
-            'basement': np.random.choice(['yes', 'no'], n_samples),
-            'hotwaterheating': np.random.choice(['yes', 'no'], n_samples),
-            'airconditioning': np.random.choice(['yes', 'no'], n_samples),
-            'parking': np.random.randint(0, 4, n_samples),
-            'prefarea': np.random.choice(['yes', 'no'], n_samples),
-            'furnishingstatus': np.random.choice(['furnished', 'semi-furnished', 'unfurnished'], n_samples)
+            'price': uniform(1000000, 15000000),
+            'area': uniform(1500, 12000),
+            'bedrooms': integers(1, 6),
+            'bathrooms': integers(1, 4),
+            'stories': integers(1, 4),
+            'mainroad': choice(YES_NO_MAP),
+            'guestroom': choice(YES_NO_MAP),
+            'basement': choice(YES_NO_MAP),
+            'hotwaterheating': choice(YES_NO_MAP),
+            'airconditioning': choice(YES_NO_MAP),
+            'parking': integers(0, 4),
+            'prefarea': choice(YES_NO_MAP),
+            'furnishingstatus': choice(FURNISHING_MAP)
         }
         
         return pd.DataFrame(data)
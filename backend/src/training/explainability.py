@@ -8,6 +8,40 @@ import matplotlib.pyplot as plt
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    # RAPIDS GPU TreeSHAP; only present on CUDA hosts
+    from cuml.explainer import TreeExplainer as GPUTreeExplainer
+    CUML_AVAILABLE = True
+except ImportError:
+    CUML_AVAILABLE = False
+
+try:
+    # Vectorized Kernel SHAP (all coalitions for a batch in one predict call)
+    import fastshap
+    FASTSHAP_AVAILABLE = True
+except ImportError:
+    FASTSHAP_AVAILABLE = False
+
+# Up to this many features the Exact explainer (2^M coalitions) is used
+# ahead of sampling-based explainers when TreeExplainer does not apply
+EXACT_MAX_FEATURES = 12
+
+
+def _lime_one(lime_explainer, predict_fn, instance_array, num_features=10):
+    """
+    LIME feature contributions for one instance
+    Module-level so joblib can pickle it for worker processes
+    """
+    explanation = lime_explainer.explain_instance(
+        instance_array,
+        predict_fn,
+        num_features=num_features
+    )
+    
+    # Extract feature contributions
+    return dict(explanation.as_list())
+
+
 class ModelExplainability:
     """Provide model interpretability using SHAP and LIME"""
     
@@ -17,23 +51,57 @@ class ModelExplainability:
         self.feature_names = feature_names
         self.shap_explainer = None
         self.lime_explainer = None
+        self._background = None
+        self._importance_sample = {}
         
+    def background_sample(self, max_samples=100):
+        """Background rows for model-agnostic explainers, sampled once"""
+        if self._background is None:
+            self._background = shap.sample(self.X_train, max_samples)
+        return self._background
+    
     def initialize_shap(self):
-        """Initialize SHAP explainer"""
+        """
+        Initialize SHAP explainer
+        TreeExplainer for tree models (on GPU via cuML when available);
+        otherwise model-agnostic explainers in order of cost: Exact (few
+        features), fastshap Kernel (if installed), Permutation, then Kernel
+        """
+        if CUML_AVAILABLE:
+            try:
+                self.shap_explainer = GPUTreeExplainer(model=self.model)
+                print("Using cuML GPU TreeExplainer")
+                return
+            except Exception as e:
+                # Unsupported model type or no usable device
+                print(f"cuML TreeExplainer unavailable, using CPU: {e}")
+        
         try:
             # Try TreeExplainer for tree-based models
             self.shap_explainer = shap.TreeExplainer(self.model)
             print("Using SHAP TreeExplainer")
+            return
         except:
+            pass
+        
+        n_features = len(self.feature_names) if self.feature_names is not None else np.shape(self.X_train)[1]
+        fallbacks = [
+            ('Permutation', lambda background: shap.explainers.Permutation(self.model.predict, background)),
+            ('Kernel', lambda background: shap.KernelExplainer(self.model.predict, background)),
+        ]
+        if FASTSHAP_AVAILABLE:
+            fallbacks.insert(0, ('fastshap Kernel', lambda background: fastshap.KernelExplainer(self.model.predict, background)))
+        if n_features <= EXACT_MAX_FEATURES:
+            # 2^M coalitions is still a small, exact budget (gray-code ordered)
+            fallbacks.insert(0, ('Exact', lambda background: shap.explainers.Exact(self.model.predict, background)))
+        
+        for name, build in fallbacks:
             try:
-                # Fallback to KernelExplainer
-                background = shap.sample(self.X_train, 100)
-                self.shap_explainer = shap.KernelExplainer(
-                    self.model.predict, background
-                )
-                print("Using SHAP KernelExplainer")
+                self.shap_explainer = build(self.background_sample())
+                print(f"Using SHAP {name} explainer")
+                return
             except Exception as e:
-                print(f"Could not initialize SHAP: {e}")
+                print(f"Could not initialize SHAP {name} explainer: {e}")
                 
     def initialize_lime(self):
         """Initialize LIME explainer"""
@@ -57,7 +125,17 @@ class ModelExplainability:
             return None
         
         try:
-            shap_values = self.shap_explainer.shap_values(X)
+            legacy = getattr(self.shap_explainer, 'shap_values', None)
+            if FASTSHAP_AVAILABLE and isinstance(self.shap_explainer, fastshap.KernelExplainer):
+                # Last column is the expected value
+                shap_values = self.shap_explainer.calculate_shap_values(
+                    X, outer_batch_size=64, inner_batch_size=256, verbose=False
+                )[:, :-1]
+            elif legacy is not None:
+                shap_values = legacy(X)
+            else:
+                # Explainers from shap.explainers return an Explanation object
+                shap_values = self.shap_explainer(X).values
             return shap_values
         except Exception as e:
             print(f"Error calculating SHAP values: {e}")
@@ -78,18 +156,19 @@ class ModelExplainability:
         else:
             shap_values_instance = shap_values
         
-        # Create explanation dictionary
-        explanation = {}
-        for i, feature in enumerate(self.feature_names):
-            explanation[feature] = {
-                'shap_value': float(shap_values_instance[i]),
-                'feature_value': float(instance.iloc[instance_index, i] if isinstance(instance, pd.DataFrame) 
-                                      else instance[instance_index, i])
-            }
+        # Pull the row out once instead of .iloc per feature
+        arr = instance.to_numpy() if isinstance(instance, pd.DataFrame) else np.asarray(instance)
+        row = arr[instance_index].tolist()
+        
+        # Create explanation items
+        explanation = [
+            (feature, {'shap_value': float(shap_value), 'feature_value': float(feature_value)})
+            for feature, shap_value, feature_value in zip(self.feature_names, shap_values_instance.tolist(), row)
+        ]
         
         # Sort by absolute SHAP value
         sorted_explanation = dict(
-            sorted(explanation.items(), 
+            sorted(explanation, 
                    key=lambda x: abs(x[1]['shap_value']), 
                    reverse=True)
         )
@@ -108,54 +187,73 @@ class ModelExplainability:
         
         try:
             instance_array = instance.values[0] if isinstance(instance, pd.DataFrame) else instance[0]
-            
-            explanation = self.lime_explainer.explain_instance(
-                instance_array,
-                self.model.predict,
-                num_features=num_features
-            )
-            
-            # Extract feature contributions
-            lime_explanation = {}
-            for feature, weight in explanation.as_list():
-                lime_explanation[feature] = weight
-            
-            return lime_explanation
+            return _lime_one(self.lime_explainer, self.model.predict, instance_array, num_features)
         except Exception as e:
             print(f"Error with LIME explanation: {e}")
             return None
     
-    def get_global_feature_importance(self, X_sample=None, max_samples=100):
+    def explain_predictions_lime_batch(self, instances, num_features=10, n_jobs=-1):
         """
-        Get global feature importance using SHAP
+        Explain many predictions using LIME, one worker process per instance
+        Returns a list of {feature: weight} dicts in input order
+        """
+        if self.lime_explainer is None:
+            self.initialize_lime()
+        
+        if self.lime_explainer is None:
+            return None
+        
+        from joblib import Parallel, delayed
+        
+        rows = instances.values if isinstance(instances, pd.DataFrame) else np.atleast_2d(instances)
+        try:
+            # Only the explainer and the bound predict method are shipped to
+            # workers, not self (training data and SHAP explainer)
+            return Parallel(n_jobs=n_jobs, backend='loky')(
+                delayed(_lime_one)(self.lime_explainer, self.model.predict, row, num_features)
+                for row in rows
+            )
+        except Exception as e:
+            print(f"Error with batch LIME explanation: {e}")
+            return None
+    
+    def get_global_importance_arrays(self, X_sample=None, max_samples=100):
+        """
+        Mean absolute SHAP value per feature as parallel (names, values) arrays
         """
         if X_sample is None:
-            # Sample from training data
-            if len(self.X_train) > max_samples:
-                indices = np.random.choice(len(self.X_train), max_samples, replace=False)
-                X_sample = self.X_train.iloc[indices] if isinstance(self.X_train, pd.DataFrame) else self.X_train[indices]
-            else:
-                X_sample = self.X_train
+            # Sample from training data once per sample size, so repeated calls
+            # rank features on the same rows
+            X_sample = self._importance_sample.get(max_samples)
+            if X_sample is None:
+                if len(self.X_train) > max_samples:
+                    indices = np.random.choice(len(self.X_train), max_samples, replace=False)
+                    X_sample = self.X_train.iloc[indices] if isinstance(self.X_train, pd.DataFrame) else self.X_train[indices]
+                else:
+                    X_sample = self.X_train
+                self._importance_sample[max_samples] = X_sample
         
         shap_values = self.get_shap_values(X_sample)
         
         if shap_values is None:
             return None
         
-        # Calculate mean absolute SHAP values
-        mean_abs_shap = np.abs(shap_values).mean(axis=0)
+        return np.asarray(self.feature_names), np.abs(shap_values).mean(axis=0)
+    
+    def get_global_feature_importance(self, X_sample=None, max_samples=100):
+        """
+        Get global feature importance using SHAP
+        """
+        arrays = self.get_global_importance_arrays(X_sample, max_samples)
+        
+        if arrays is None:
+            return None
         
-        # Create importance dictionary
-        importance = {}
-        for i, feature in enumerate(self.feature_names):
-            importance[feature] = float(mean_abs_shap[i])
+        names, mean_abs_shap = arrays
         
         # Sort by importance
-        sorted_importance = dict(
-            sorted(importance.items(), key=lambda x: x[1], reverse=True)
-        )
-        
-        return sorted_importance
+        order = np.argsort(-mean_abs_shap)
+        return {str(names[i]): float(mean_abs_shap[i]) for i in order}
     
     def generate_explanation_text(self, explanation, prediction_value):
         """
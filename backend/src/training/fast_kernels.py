@@ -0,0 +1,105 @@
+# src/fast_kernels.py
+
+"""
+Compiled kernels for the single-row inference hot path and batch scoring.
+Numba is optional: without it the same functions run as plain NumPy.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def encode_row(area, bedrooms, bathrooms, stories, mainroad, guestroom, basement,
+                   hotwaterheating, airconditioning, parking, prefarea, furnishing,
+                   positions, mean, scale, out):
+        """
+        Encode and standard-scale one property straight into `out`.
+        Arguments follow PropertyInput field order (categoricals already mapped
+        to codes); positions[k] is the scaler column of the k-th argument.
+        """
+        p = positions
+        out[p[0]] = (area - mean[p[0]]) / scale[p[0]]
+        out[p[1]] = (bedrooms - mean[p[1]]) / scale[p[1]]
+        out[p[2]] = (bathrooms - mean[p[2]]) / scale[p[2]]
+        out[p[3]] = (stories - mean[p[3]]) / scale[p[3]]
+        out[p[4]] = (mainroad - mean[p[4]]) / scale[p[4]]
+        out[p[5]] = (guestroom - mean[p[5]]) / scale[p[5]]
+        out[p[6]] = (basement - mean[p[6]]) / scale[p[6]]
+        out[p[7]] = (hotwaterheating - mean[p[7]]) / scale[p[7]]
+        out[p[8]] = (airconditioning - mean[p[8]]) / scale[p[8]]
+        out[p[9]] = (parking - mean[p[9]]) / scale[p[9]]
+        out[p[10]] = (prefarea - mean[p[10]]) / scale[p[10]]
+        out[p[11]] = (furnishing - mean[p[11]]) / scale[p[11]]
+        return out
+else:
+    def encode_row(area, bedrooms, bathrooms, stories, mainroad, guestroom, basement,
+                   hotwaterheating, airconditioning, parking, prefarea, furnishing,
+                   positions, mean, scale, out):
+        """
+        Encode and standard-scale one property straight into `out`.
+        Arguments follow PropertyInput field order (categoricals already mapped
+        to codes); positions[k] is the scaler column of the k-th argument.
+        """
+        values = np.array(
+            (area, bedrooms, bathrooms, stories, mainroad, guestroom, basement,
+             hotwaterheating, airconditioning, parking, prefarea, furnishing),
+            dtype=np.float64
+        )
+        out[positions] = (values - mean[positions]) / scale[positions]
+        return out
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def score_properties(roi, rental_yield, cap_rate, cash_flow):
+        """
+        Investment score (0-10) per property, same thresholds as
+        InvestmentAnalytics.investment_recommendation
+        """
+        n = roi.shape[0]
+        scores = np.zeros(n, dtype=np.int8)
+        for i in prange(n):
+            score = 0
+            if roi[i] > 50:
+                score += 3
+            elif roi[i] > 30:
+                score += 2
+            elif roi[i] > 15:
+                score += 1
+            if rental_yield[i] > 6:
+                score += 3
+            elif rental_yield[i] > 4:
+                score += 2
+            if cap_rate[i] > 8:
+                score += 2
+            elif cap_rate[i] > 5:
+                score += 1
+            if cash_flow[i] > 0:
+                score += 2
+            scores[i] = score
+        return scores
+else:
+    def score_properties(roi, rental_yield, cap_rate, cash_flow):
+        """
+        Investment score (0-10) per property, same thresholds as
+        InvestmentAnalytics.investment_recommendation
+        """
+        scores = (np.where(roi > 50, 3, np.where(roi > 30, 2, np.where(roi > 15, 1, 0)))
+                  + np.where(rental_yield > 6, 3, np.where(rental_yield > 4, 2, 0))
+                  + np.where(cap_rate > 8, 2, np.where(cap_rate > 5, 1, 0))
+                  + np.where(cash_flow > 0, 2, 0))
+        return scores.astype(np.int8)
+
+
+def warmup(mean, scale, positions):
+    """Trigger JIT compilation (float64 and float32 outputs) so requests don't pay for it"""
+    for dtype in (np.float64, np.float32):
+        out = np.empty(mean.shape[0], dtype=dtype)
+        encode_row(1.0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, positions, mean, scale, out)
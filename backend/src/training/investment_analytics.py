@@ -3,6 +3,30 @@
 import numpy as np
 import pandas as pd
 
+
+def overall_recommendation(score):
+    """Map an investment score (0-10) to the overall recommendation"""
+    if score >= 8:
+        return "STRONG BUY - Excellent investment opportunity"
+    elif score >= 5:
+        return "BUY - Good investment potential"
+    elif score >= 3:
+        return "HOLD - Consider carefully"
+    return "AVOID - Poor investment metrics"
+
+
+SCHEDULE_COLUMNS = ('year', 'property_value', 'appreciation_amount', 'appreciation_percentage')
+
+
+def schedule_to_dicts(schedule):
+    """Per-year dicts for an appreciation schedule array (year as int)"""
+    return [
+        {'year': int(row[0]), 'property_value': row[1],
+         'appreciation_amount': row[2], 'appreciation_percentage': row[3]}
+        for row in schedule.tolist()
+    ]
+
+
 class InvestmentAnalytics:
     """Calculate investment metrics for real estate properties"""
     
@@ -12,16 +36,20 @@ class InvestmentAnalytics:
         self.default_maintenance_rate = 0.01  # 1% of property value
         
     def calculate_roi(self, purchase_price, annual_rental_income, 
-                     operating_expenses, holding_period_years=5):
+                     operating_expenses, holding_period_years=5,
+                     appreciation_rate=None):
         """
         Calculate Return on Investment (ROI)
         ROI = (Net Profit / Total Investment) * 100
         """
+        if appreciation_rate is None:
+            appreciation_rate = self.default_appreciation_rate
+        
         total_rental_income = annual_rental_income * holding_period_years
         total_expenses = operating_expenses * holding_period_years
         
         # Estimate future property value with appreciation
-        future_value = purchase_price * (1 + self.default_appreciation_rate) ** holding_period_years
+        future_value = purchase_price * (1 + appreciation_rate) ** holding_period_years
         
         # Calculate net profit
         net_profit = (future_value - purchase_price) + (total_rental_income - total_expenses)
@@ -60,24 +88,25 @@ class InvestmentAnalytics:
                               appreciation_rate=None):
         """
         Calculate property price appreciation over time
+        The schedule is a (years, 4) float array with SCHEDULE_COLUMNS
+        (use schedule_to_dicts for a list of per-year dicts). Values are
+        compounded with one cumulative product, in the same order as a
+        year-by-year loop so the figures match it exactly
         """
         if appreciation_rate is None:
             appreciation_rate = self.default_appreciation_rate
         
-        appreciation_schedule = []
-        current_value = purchase_price
-        
-        for year in range(1, years + 1):
-            current_value = current_value * (1 + appreciation_rate)
-            appreciation_amount = current_value - purchase_price
-            appreciation_percentage = (appreciation_amount / purchase_price) * 100
-            
-            appreciation_schedule.append({
-                'year': year,
-                'property_value': current_value,
-                'appreciation_amount': appreciation_amount,
-                'appreciation_percentage': appreciation_percentage
-            })
+        appreciation_schedule = np.empty((years, 4), dtype=np.float64)
+        year, values, amounts, percentages = appreciation_schedule.T
+        year[:] = np.arange(1, years + 1)
+        values[:] = 1 + appreciation_rate
+        if years > 0:
+            values[0] = purchase_price * values[0]
+        np.multiply.accumulate(values, out=values)
+        np.subtract(values, purchase_price, out=amounts)
+        np.divide(amounts, purchase_price, out=percentages)
+        percentages *= 100
+        current_value = values[-1].item() if years > 0 else purchase_price
         
         return {
             'appreciation_schedule': appreciation_schedule,
@@ -88,11 +117,14 @@ class InvestmentAnalytics:
     
     def calculate_cash_flow(self, purchase_price, annual_rental_income,
                            mortgage_payment=0, property_tax=0,
-                           insurance=0, maintenance=0):
+                           insurance=0, maintenance=0, vacancy_rate=None):
         """
         Calculate annual cash flow
         Cash Flow = Income - Expenses
         """
+        if vacancy_rate is None:
+            vacancy_rate = self.default_vacancy_rate
+        
         # If maintenance not provided, estimate as 1% of property value
         if maintenance == 0:
             maintenance = purchase_price * self.default_maintenance_rate
@@ -100,7 +132,7 @@ class InvestmentAnalytics:
         total_expenses = mortgage_payment + property_tax + insurance + maintenance
         
         # Account for vacancy
-        effective_rental_income = annual_rental_income * (1 - self.default_vacancy_rate)
+        effective_rental_income = annual_rental_income * (1 - vacancy_rate)
         
         annual_cash_flow = effective_rental_income - total_expenses
         monthly_cash_flow = annual_cash_flow / 12
@@ -132,6 +164,45 @@ class InvestmentAnalytics:
             'operating_expenses': operating_expenses
         }
     
+    def calculate_financing(self, purchase_price, down_payment_percent=20,
+                            loan_interest_rate=7.5, loan_term_years=30,
+                            holding_period_years=5):
+        """
+        Calculate mortgage payment and loan balance over the holding period
+        Uses the closed-form amortization formulas instead of a monthly loop:
+        Payment = L * r / (1 - (1 + r)^-n)
+        Balance_t = L * ((1 + r)^n - (1 + r)^t) / ((1 + r)^n - 1)
+        """
+        loan_amount = purchase_price * (1 - down_payment_percent / 100)
+        n_payments = loan_term_years * 12
+        monthly_rate = loan_interest_rate / 100 / 12
+        
+        # Month index at the end of each holding year (capped at loan payoff)
+        months = np.minimum(np.arange(1, holding_period_years + 1) * 12, n_payments)
+        
+        if monthly_rate == 0:
+            monthly_payment = loan_amount / n_payments
+            balances = loan_amount * (1 - months / n_payments)
+        else:
+            growth_n = (1 + monthly_rate) ** n_payments
+            monthly_payment = loan_amount * monthly_rate / (1 - 1 / growth_n)
+            balances = loan_amount * (growth_n - (1 + monthly_rate) ** months) / (growth_n - 1)
+        
+        remaining_balance = float(balances[-1])
+        principal_paid = loan_amount - remaining_balance
+        interest_paid = monthly_payment * months[-1] - principal_paid
+        
+        return {
+            'loan_amount': loan_amount,
+            'down_payment': purchase_price - loan_amount,
+            'monthly_payment': monthly_payment,
+            'annual_debt_service': monthly_payment * 12,
+            'remaining_balance': remaining_balance,
+            'principal_paid': principal_paid,
+            'interest_paid': interest_paid,
+            'balance_by_year': balances.tolist()
+        }
+    
     def calculate_break_even_point(self, purchase_price, annual_rental_income,
                                    annual_expenses):
         """
@@ -159,29 +230,164 @@ class InvestmentAnalytics:
         
         property_data should contain:
         - purchase_price
-        - annual_rental_income
-        - operating_expenses (optional)
+        - annual_rental_income or monthly_rental_income
+        - operating_expenses or annual_property_tax / annual_insurance /
+          annual_maintenance (optional)
         - holding_period_years (optional)
+        - annual_appreciation_rate, vacancy_rate in percent (optional)
+        - down_payment_percent, loan_interest_rate, loan_term_years (optional)
         """
         purchase_price = property_data['purchase_price']
-        annual_rental_income = property_data.get('annual_rental_income', purchase_price * 0.05)
-        operating_expenses = property_data.get('operating_expenses', purchase_price * 0.02)
+        if 'monthly_rental_income' in property_data:
+            default_rental_income = property_data['monthly_rental_income'] * 12
+        else:
+            default_rental_income = purchase_price * 0.05
+        annual_rental_income = property_data.get('annual_rental_income', default_rental_income)
+        
+        property_tax = property_data.get('annual_property_tax', 0)
+        insurance = property_data.get('annual_insurance', 0)
+        maintenance = property_data.get('annual_maintenance', 0)
+        itemized_expenses = property_tax + insurance + maintenance
+        operating_expenses = property_data.get(
+            'operating_expenses', itemized_expenses or purchase_price * 0.02
+        )
         holding_period = property_data.get('holding_period_years', 5)
         
+        appreciation_rate = property_data.get('annual_appreciation_rate')
+        if appreciation_rate is not None:
+            appreciation_rate = appreciation_rate / 100
+        vacancy_rate = property_data.get('vacancy_rate')
+        if vacancy_rate is not None:
+            vacancy_rate = vacancy_rate / 100
+        
+        # Financing is only analysed when loan terms are supplied
+        financing = None
+        mortgage_payment = 0
+        if 'loan_interest_rate' in property_data:
+            financing = self.calculate_financing(
+                purchase_price,
+                property_data.get('down_payment_percent', 20),
+                property_data['loan_interest_rate'],
+                property_data.get('loan_term_years', 30),
+                holding_period
+            )
+            mortgage_payment = financing['annual_debt_service']
+        
         analysis = {
             'property_price': purchase_price,
             'roi': self.calculate_roi(purchase_price, annual_rental_income, 
-                                     operating_expenses, holding_period),
+                                     operating_expenses, holding_period,
+                                     appreciation_rate),
             'rental_yield': self.calculate_rental_yield(purchase_price, annual_rental_income),
-            'appreciation': self.calculate_appreciation(purchase_price, holding_period),
-            'cash_flow': self.calculate_cash_flow(purchase_price, annual_rental_income),
+            'appreciation': self.calculate_appreciation(purchase_price, holding_period,
+                                                        appreciation_rate),
+            'cash_flow': self.calculate_cash_flow(purchase_price, annual_rental_income,
+                                                  mortgage_payment, property_tax,
+                                                  insurance, maintenance, vacancy_rate),
             'cap_rate': self.calculate_cap_rate(purchase_price, annual_rental_income),
             'break_even': self.calculate_break_even_point(purchase_price, annual_rental_income, 
                                                           operating_expenses)
         }
         
+        if financing is not None:
+            analysis['financing'] = financing
+        
         return analysis
     
+    def comprehensive_analysis_batch(self, properties):
+        """
+        Vectorized comprehensive_analysis for many properties at once
+        
+        properties is a DataFrame with one row per property and the same
+        fields comprehensive_analysis accepts as columns (only purchase_price
+        is required; missing columns or NaN cells fall back to the same
+        defaults). Returns a DataFrame of the headline metrics, one row per
+        property, computed with column arithmetic instead of per-row calls.
+        """
+        def column(name, default=np.nan):
+            if name not in properties.columns:
+                return np.broadcast_to(np.asarray(default, dtype=np.float64), (len(properties),)).copy()
+            values = properties[name].to_numpy(dtype=np.float64)
+            return np.where(np.isnan(values), default, values)
+        
+        price = column('purchase_price')
+        rental_income = column('annual_rental_income',
+                               column('monthly_rental_income') * 12)
+        rental_income = np.where(np.isnan(rental_income), price * 0.05, rental_income)
+        
+        property_tax = column('annual_property_tax', 0)
+        insurance = column('annual_insurance', 0)
+        maintenance = column('annual_maintenance', 0)
+        itemized_expenses = property_tax + insurance + maintenance
+        operating_expenses = column(
+            'operating_expenses',
+            np.where(itemized_expenses != 0, itemized_expenses, price * 0.02)
+        )
+        holding_period = column('holding_period_years', 5)
+        appreciation_rate = column('annual_appreciation_rate', self.default_appreciation_rate * 100) / 100
+        vacancy_rate = column('vacancy_rate', self.default_vacancy_rate * 100) / 100
+        
+        # Financing, only for rows with loan terms
+        interest_rate = column('loan_interest_rate')
+        has_loan = ~np.isnan(interest_rate)
+        loan_amount = price * (1 - column('down_payment_percent', 20) / 100)
+        n_payments = column('loan_term_years', 30) * 12
+        monthly_rate = np.where(has_loan, interest_rate, 0) / 100 / 12
+        months = np.minimum(holding_period * 12, n_payments)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth_n = (1 + monthly_rate) ** n_payments
+            monthly_payment = np.where(
+                monthly_rate == 0,
+                loan_amount / n_payments,
+                loan_amount * monthly_rate / (1 - 1 / growth_n)
+            )
+            remaining_balance = np.where(
+                monthly_rate == 0,
+                loan_amount * (1 - months / n_payments),
+                loan_amount * (growth_n - (1 + monthly_rate) ** months) / (growth_n - 1)
+            )
+        annual_debt_service = np.where(has_loan, monthly_payment * 12, np.nan)
+        mortgage_payment = np.where(has_loan, annual_debt_service, 0)
+        
+        # ROI and appreciation
+        future_value = price * (1 + appreciation_rate) ** holding_period
+        net_profit = (future_value - price) + (rental_income - operating_expenses) * holding_period
+        
+        # Rental yield and cap rate use the default expense ratios, as the scalar methods do
+        default_expenses = price * (self.default_maintenance_rate + self.default_vacancy_rate)
+        net_rental_income = rental_income - default_expenses
+        
+        # Cash flow
+        cash_flow_maintenance = np.where(maintenance == 0, price * self.default_maintenance_rate, maintenance)
+        annual_cash_flow = (rental_income * (1 - vacancy_rate)
+                            - (mortgage_payment + property_tax + insurance + cash_flow_maintenance))
+        
+        # Break-even
+        annual_net_income = rental_income - operating_expenses
+        with np.errstate(divide='ignore'):
+            break_even_years = np.where(annual_net_income > 0, price / annual_net_income, np.nan)
+        
+        return pd.DataFrame({
+            'property_price': price,
+            'roi_percentage': net_profit / price * 100,
+            'net_profit': net_profit,
+            'future_property_value': future_value,
+            'gross_yield_percentage': rental_income / price * 100,
+            'net_yield_percentage': net_rental_income / price * 100,
+            'net_annual_income': net_rental_income,
+            'total_appreciation': future_value - price,
+            'total_appreciation_percentage': (future_value - price) / price * 100,
+            'annual_cash_flow': annual_cash_flow,
+            'monthly_cash_flow': annual_cash_flow / 12,
+            'cash_on_cash_return': annual_cash_flow / price * 100,
+            'cap_rate_percentage': net_rental_income / price * 100,
+            'net_operating_income': net_rental_income,
+            'break_even_years': break_even_years,
+            'monthly_payment': np.where(has_loan, monthly_payment, np.nan),
+            'annual_debt_service': annual_debt_service,
+            'remaining_balance': np.where(has_loan, remaining_balance, np.nan),
+        }, index=properties.index)
+    
     def investment_recommendation(self, analysis):
         """
         Provide investment recommendation based on metrics
@@ -232,21 +438,32 @@ class InvestmentAnalytics:
         else:
             recommendations.append("Negative cash flow - requires capital")
         
-        # Overall recommendation
-        if score >= 8:
-            overall = "STRONG BUY - Excellent investment opportunity"
-        elif score >= 5:
-            overall = "BUY - Good investment potential"
-        elif score >= 3:
-            overall = "HOLD - Consider carefully"
-        else:
-            overall = "AVOID - Poor investment metrics"
-        
         return {
             'score': score,
-            'overall_recommendation': overall,
+            'overall_recommendation': overall_recommendation(score),
             'detailed_recommendations': recommendations
         }
+    
+    def investment_recommendation_batch(self, analysis):
+        """
+        Score many properties at once from a comprehensive_analysis_batch
+        DataFrame; the branchy scoring runs in a compiled kernel.
+        Returns a DataFrame with the score and overall recommendation per row.
+        """
+        # Imported here so numba only loads when batch scoring is used
+        from fast_kernels import score_properties
+        
+        roi, rental_yield, cap_rate, cash_flow = (
+            analysis[name].to_numpy(dtype=np.float64)
+            for name in ('roi_percentage', 'net_yield_percentage',
+                         'cap_rate_percentage', 'annual_cash_flow')
+        )
+        scores = score_properties(roi, rental_yield, cap_rate, cash_flow)
+        labels = np.array([overall_recommendation(score) for score in range(11)], dtype=object)
+        return pd.DataFrame({
+            'score': scores,
+            'overall_recommendation': labels[scores]
+        }, index=analysis.index)
 
 # Example usage
 if __name__ == "__main__":
@@ -182,23 +182,28 @@ class RealEstatePredictiveModels:
         
         for name, model in self.models.items():
             if name == 'neural_network':
-                model.save(f'{directory}{name}.h5')
+                model.save(os.path.join(directory, f'{name}.h5'))
             else:
-                joblib.dump(model, f'{directory}{name}.pkl')
+                # Uncompressed, protocol 5: numpy arrays stay mmap-able at load time
+                joblib.dump(model, os.path.join(directory, f'{name}.pkl'), compress=0, protocol=5)
         
         print(f"Models saved to {directory}")
     
-    def load_models(self, directory='models/saved_models/'):
-        """Load pre-trained models"""
+    def load_models(self, directory='models/saved_models/', names=None, mmap_mode=None):
+        """
+        Load pre-trained models (only those in `names`, if given)
+        mmap_mode='r' keeps numpy arrays inside the pickles file-backed
+        """
         import os
         
         for filename in os.listdir(directory):
-            if filename.endswith('.pkl'):
-                name = filename.replace('.pkl', '')
-                self.models[name] = joblib.load(f'{directory}{filename}')
-            elif filename.endswith('.h5'):
-                name = filename.replace('.h5', '')
-                self.models[name] = keras.models.load_model(f'{directory}{filename}')
+            name, ext = os.path.splitext(filename)
+            if names is not None and name not in names:
+                continue
+            if ext == '.pkl':
+                self.models[name] = joblib.load(os.path.join(directory, filename), mmap_mode=mmap_mode)
+            elif ext == '.h5':
+                self.models[name] = keras.models.load_model(os.path.join(directory, filename))
         
         print(f"Loaded {len(self.models)} models")
 
@@ -15,7 +15,7 @@ import logging
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from data_preprocessing import RealEstateDataPreprocessor
+from data_preprocessing import RealEstateDataPreprocessor, CATEGORY_MAPS
 from predictive_models import RealEstatePredictiveModels
 
 logging.basicConfig(
@@ -32,6 +32,7 @@ class GCPModelTrainer:
         self.preprocessor = RealEstateDataPreprocessor()
         self.models = RealEstatePredictiveModels()
         self.results = {}
+        self.background = None
         
         logger.info("GCP Model Trainer initialized")
         logger.info(f"Data path: {data_path}")
@@ -50,7 +51,7 @@ class GCPModelTrainer:
             logger.error("Please provide the Housing.csv file")
             raise FileNotFoundError(f"Data file not found: {self.data_path}")
         else:
-            df = pd.read_csv(self.data_path)
+            df = self.preprocessor.load_data(self.data_path)
             logger.info(f"✓ Data loaded: {len(df)} records")
         
         logger.info(f"✓ Columns: {list(df.columns)}")
@@ -67,6 +68,11 @@ class GCPModelTrainer:
         logger.info(f"✓ Training set: {X_train.shape}")
         logger.info(f"✓ Test set: {X_test.shape}")
         
+        # Keep a small scaled sample for SHAP background / global importance
+        self.background = X_train.sample(
+            n=min(100, len(X_train)), random_state=42
+        ).to_numpy(dtype=np.float64)
+        
         # Step 4: Train ALL models
         logger.info("\n" + "="*70)
         logger.info("Step 4: Training all models...")
@@ -147,10 +153,37 @@ class GCPModelTrainer:
         # Save preprocessor
         joblib.dump(
             self.preprocessor, 
-            os.path.join(path, 'preprocessor.pkl')
+            os.path.join(path, 'preprocessor.pkl'),
+            compress=0,
+            protocol=5
         )
         logger.info("✓ Preprocessor saved")
         
+        # Save scaler statistics for the API's direct transform (row 0: mean, row 1: scale)
+        scaler = self.preprocessor.scaler
+        np.save(
+            os.path.join(path, 'scaler.npy'),
+            np.vstack([scaler.mean_, scaler.scale_]).astype(np.float64)
+        )
+        logger.info("✓ Scaler statistics saved")
+        
+        # Save the feature layout as plain JSON so the API can featurize from
+        # scaler.npy without unpickling the preprocessor
+        with open(os.path.join(path, 'feature_layout.json'), 'w') as f:
+            json.dump({
+                'feature_names': list(self.preprocessor.feature_names),
+                'category_maps': CATEGORY_MAPS
+            }, f, indent=2)
+        logger.info("✓ Feature layout saved")
+        
+        # Save SHAP background sample
+        if self.background is not None:
+            np.save(os.path.join(path, 'background.npy'), self.background)
+            logger.info("✓ SHAP background sample saved")
+        
+        # Export the best model to ONNX for onnxruntime serving (optional)
+        self.export_best_model_onnx(path)
+        
         # Save metadata
         metadata = {
             'best_model': self.models.best_model_name,
@@ -182,6 +215,40 @@ class GCPModelTrainer:
         
         return metadata
     
+    def export_best_model_onnx(self, path):
+        """Export the best model to model.onnx; the API falls back to the pickle if absent"""
+        name = self.models.best_model_name
+        model = self.models.best_model
+        n_features = len(self.preprocessor.feature_names)
+        
+        try:
+            if name == 'xgboost':
+                from onnxmltools import convert_xgboost
+                from onnxmltools.convert.common.data_types import FloatTensorType
+                onnx_model = convert_xgboost(model, initial_types=[('x', FloatTensorType([None, n_features]))])
+            elif name == 'lightgbm':
+                from onnxmltools import convert_lightgbm
+                from onnxmltools.convert.common.data_types import FloatTensorType
+                onnx_model = convert_lightgbm(model, initial_types=[('x', FloatTensorType([None, n_features]))])
+            elif name == 'neural_network':
+                logger.info("ONNX export skipped for the Keras model")
+                return False
+            else:
+                from skl2onnx import convert_sklearn
+                from skl2onnx.common.data_types import FloatTensorType
+                onnx_model = convert_sklearn(model, initial_types=[('x', FloatTensorType([None, n_features]))])
+        except ImportError as e:
+            logger.warning(f"ONNX converters not installed, skipping export: {e}")
+            return False
+        except Exception as e:
+            logger.warning(f"ONNX export failed for {name}: {e}")
+            return False
+        
+        with open(os.path.join(path, 'model.onnx'), 'wb') as f:
+            f.write(onnx_model.SerializeToString())
+        logger.info(f"✓ {name} exported to ONNX")
+        return True
+    
     def upload_to_gcs(self, bucket_name, local_path='models/saved_models', gcs_path='models/latest'):
         """Upload trained models to Google Cloud Storage"""
         
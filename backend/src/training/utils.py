@@ -77,31 +77,33 @@ def calculate_mortgage_payment(principal, annual_rate, years):
 def calculate_loan_amortization(principal, annual_rate, years):
     """
     Calculate loan amortization schedule
+    Balances come from the closed form B_t = P * ((1+r)^n - (1+r)^t) / ((1+r)^n - 1),
+    so the whole schedule is built from NumPy arrays instead of a monthly loop
     
     Returns:
         DataFrame with amortization schedule
     """
     monthly_payment = calculate_mortgage_payment(principal, annual_rate, years)
     monthly_rate = annual_rate / 12
-    n_payments = years * 12
-    
-    schedule = []
-    balance = principal
+    n_payments = int(years * 12)
     
-    for month in range(1, int(n_payments) + 1):
-        interest_payment = balance * monthly_rate
-        principal_payment = monthly_payment - interest_payment
-        balance -= principal_payment
-        
-        schedule.append({
-            'Month': month,
-            'Payment': monthly_payment,
-            'Principal': principal_payment,
-            'Interest': interest_payment,
-            'Balance': max(0, balance)
-        })
-    
-    return pd.DataFrame(schedule)
+    # Balance at the start of each month (t = 0 .. n-1) and after it (t = 1 .. n)
+    months = np.arange(n_payments + 1)
+    if monthly_rate == 0:
+        balances = principal * (1 - months / n_payments)
+    else:
+        growth = (1 + monthly_rate) ** months
+        balances = principal * (growth[-1] - growth) / (growth[-1] - 1)
+    
+    interest_payments = balances[:-1] * monthly_rate
+    
+    return pd.DataFrame({
+        'Month': months[1:],
+        'Payment': np.full(n_payments, monthly_payment),
+        'Principal': monthly_payment - interest_payments,
+        'Interest': interest_payments,
+        'Balance': np.maximum(balances[1:], 0)
+    })
 
 def validate_property_data(property_data):
     """
@@ -0,0 +1,120 @@
+# tests/test_chatbot_cache.py
+
+import asyncio
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'training'))
+
+import chatbot
+
+
+class _Message:
+    def __init__(self, type, content):
+        self.type = type
+        self.content = content
+
+
+class _Response:
+    def __init__(self, content):
+        self.content = content
+
+
+class _FakeLLM:
+    """Counts calls and answers with a fresh string each time"""
+    def __init__(self, **kwargs):
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return _Response(f"answer {self.calls}")
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        answer = f"answer to {messages[-1].content} after {len(messages) - 1} messages"
+        # Yield so a concurrent turn can run while this one waits on "Groq"
+        await asyncio.sleep(0.01)
+        return _Response(answer)
+
+
+class _FakeMemory:
+    """Plain list of turns in place of WindowedSummaryMemory"""
+    def __init__(self, memory_key='chat_history', **kwargs):
+        self.memory_key = memory_key
+        self.messages = []
+
+    def load_memory_variables(self, inputs):
+        return {self.memory_key: list(self.messages)}
+
+    def save_context(self, inputs, outputs):
+        self.messages += [_Message('human', inputs['input']), _Message('ai', outputs['response'])]
+
+    def clear(self):
+        self.messages = []
+
+
+class _FakePrompt:
+    def format_messages(self, chat_history, input):
+        return chat_history + [_Message('human', input)]
+
+
+class ChatbotTestCase(unittest.TestCase):
+    """Chatbot wired to the fakes above instead of Groq and LangChain"""
+
+    def setUp(self):
+        fake_modules = {
+            'dotenv': types.SimpleNamespace(load_dotenv=lambda: None),
+            'langchain_groq': types.SimpleNamespace(ChatGroq=_FakeLLM),
+            'chat_memory': types.SimpleNamespace(WindowedSummaryMemory=_FakeMemory),
+        }
+        patches = [mock.patch.dict(sys.modules, fake_modules),
+                   mock.patch.object(chatbot, 'chat_prompt', _FakePrompt)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.bot = chatbot.RealEstateInvestmentChatbot(api_key='test')
+
+
+class ResponseCacheTest(ChatbotTestCase):
+    """The response cache must only replay answers given the same history"""
+
+    def test_same_message_and_history_hits_cache(self):
+        first = self.bot.chat("What is ROI?")
+        self.bot.memory.clear()
+        second = self.bot.chat("What is ROI?")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.bot.llm.calls, 1)
+
+    def test_same_message_with_different_history_misses_cache(self):
+        self.bot.chat("What is ROI?")
+        first = self.bot.chat("Why?")
+        self.bot.memory.clear()
+        self.bot.chat("What is cap rate?")
+        second = self.bot.chat("Why?")
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.bot.llm.calls, 4)
+
+
+
+class ConcurrentTurnsTest(ChatbotTestCase):
+    """Overlapping achat() calls on the shared chatbot run one turn at a time"""
+
+    def test_overlapping_achat_calls_see_each_other(self):
+        async def run():
+            return await asyncio.gather(self.bot.achat("first"), self.bot.achat("second"))
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(first, "answer to first after 0 messages")
+        self.assertEqual(second, "answer to second after 2 messages")
+        self.assertEqual([m.content for m in self.bot.memory.messages],
+                         ["first", first, "second", second])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# tests/test_lru_cache.py
+
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api'))
+
+from main import LRUCache
+
+
+class GetOrComputeTest(unittest.TestCase):
+    """Request coalescing and reload invalidation of the API response caches"""
+
+    def test_concurrent_callers_share_one_compute(self):
+        cache = LRUCache(8)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'value'
+
+        async def run():
+            return await asyncio.gather(*(cache.get_or_compute('k', compute) for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get('k'), 'value')
+
+    def test_clear_during_compute_drops_stale_result(self):
+        cache = LRUCache(8)
+        started = None
+        release = None
+
+        async def stale():
+            started.set()
+            await release.wait()
+            return 'old model'
+
+        async def fresh():
+            return 'new model'
+
+        async def run():
+            nonlocal started, release
+            started, release = asyncio.Event(), asyncio.Event()
+            old = asyncio.ensure_future(cache.get_or_compute('k', stale))
+            await started.wait()
+            cache.clear()
+            # Arrives after the reload: must not join the old model's task
+            new = await asyncio.wait_for(cache.get_or_compute('k', fresh), timeout=1)
+            release.set()
+            return await old, new
+
+        old, new = asyncio.run(run())
+
+        self.assertEqual(old, 'old model')
+        self.assertEqual(new, 'new model')
+        self.assertEqual(cache.get('k'), 'new model')
+
+
+if __name__ == '__main__':
+    unittest.main()